@@ -0,0 +1,80 @@
+"""Typeahead completions over entity names.
+
+Names are kept in two sorted arrays: one keyed by the full normalised name
+and one keyed by every later word start ("beast of night", "of night",
+"night"). A prefix is answered with binary search, taking matches at the
+start of a name before matches inside it, so each lookup costs
+O(log n + k).
+"""
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+from search_index import tokenize
+
+AUTOCOMPLETE_COLLECTIONS = (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+# (normalised key, type, id, display name)
+Entry = Tuple[str, str, str, str]
+
+
+class AutocompleteIndex:
+    def __init__(self, documents: Dict[str, Iterable[Dict[str, Any]]]):
+        starts: List[Entry] = []
+        inner: List[Entry] = []
+        for collection in AUTOCOMPLETE_COLLECTIONS:
+            for document in documents.get(collection, ()):
+                name = document.get("name")
+                if not name:
+                    continue
+                words = tokenize(name)
+                starts.append((" ".join(words), collection, document["id"], name))
+                for position in range(1, len(words)):
+                    inner.append((" ".join(words[position:]), collection, document["id"], name))
+        self._starts = sorted(starts)
+        self._inner = sorted(inner)
+        self._start_keys = [entry[0] for entry in self._starts]
+        self._inner_keys = [entry[0] for entry in self._inner]
+
+    @staticmethod
+    def _scan(keys: List[str], entries: List[Entry], prefix: str):
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield entries[position]
+            position += 1
+
+    def complete(self, prefix: str, limit: int = DEFAULT_AUTOCOMPLETE_LIMIT) -> List[Dict[str, str]]:
+        normalized = " ".join(tokenize(prefix))
+        if not normalized:
+            return []
+
+        completions: List[Dict[str, str]] = []
+        seen: Set[Tuple[str, str]] = set()
+        for keys, entries in ((self._start_keys, self._starts), (self._inner_keys, self._inner)):
+            for _, collection, entity_id, name in self._scan(keys, entries, normalized):
+                if (collection, entity_id) in seen:
+                    continue
+                seen.add((collection, entity_id))
+                completions.append({"type": collection, "id": entity_id, "name": name})
+                if len(completions) >= limit:
+                    return completions
+        return completions
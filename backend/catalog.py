@@ -0,0 +1,190 @@
+"""In-process snapshot of the static catalog collections.
+
+The catalog is seed data that only changes when the seed changes, so it is
+read from Mongo once at startup and list/detail endpoints are served from
+memory. Call reload_catalog() after the seed data has been rewritten.
+"""
+import asyncio
+import hashlib
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+import database
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    ACHIEVEMENTS,
+    WALKTHROUGHS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+from responses import BodyValidator, catalog_body, encode_json
+from autocomplete import AutocompleteIndex
+from graph import CatalogGraph
+from search_index import SearchIndex
+from similarity import load_similarity_index
+from team_optimizer import TeamOptimizer
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLLECTIONS = (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    ACHIEVEMENTS,
+    WALKTHROUGHS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+
+# Order of the list endpoints, where it matters
+LIST_SORT = {ACHIEVEMENTS: [("rank", 1)]}
+
+# Field used by detail lookups; everything else is looked up by id
+DETAIL_KEYS = {WALKTHROUGHS: "character"}
+
+
+class CatalogSnapshot:
+    """Read-only view of every catalog collection.
+
+    Documents are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, documents: Dict[str, List[Dict[str, Any]]]):
+        self._lists = MappingProxyType({
+            collection: tuple(documents.get(collection, ()))
+            for collection in CATALOG_COLLECTIONS
+        })
+        self._by_key = MappingProxyType({
+            collection: MappingProxyType({
+                document[DETAIL_KEYS.get(collection, "id")]: document
+                for document in docs
+            })
+            for collection, docs in self._lists.items()
+        })
+        self.search_index = SearchIndex(self._lists)
+        self.autocomplete = AutocompleteIndex(self._lists)
+        self.graph = CatalogGraph(self._lists)
+        self.team_optimizer = TeamOptimizer(self._lists, self.graph)
+        # Content version of the whole catalog, changes whenever any document does
+        self.version = hashlib.sha256(
+            encode_json({collection: list(docs) for collection, docs in self._lists.items()})
+        ).hexdigest()[:16]
+        # Encoded bodies, or only their validators when pre-serialization is off.
+        # List payloads are keyed by collection name, e.g. {"bosses": [...]}
+        self._list_bodies = MappingProxyType({
+            collection: catalog_body({collection: list(docs)})
+            for collection, docs in self._lists.items()
+        })
+        self._detail_bodies = MappingProxyType({
+            collection: MappingProxyType({key: catalog_body(document) for key, document in docs.items()})
+            for collection, docs in self._by_key.items()
+        })
+        self._bootstrap_body = catalog_body(self.bootstrap())
+        self._recommendations = MappingProxyType({
+            boss["id"]: self._recommendation_bundle(boss) for boss in self._lists[BOSSES]
+        })
+        self._recommendation_bodies = MappingProxyType({
+            boss_id: catalog_body(bundle) for boss_id, bundle in self._recommendations.items()
+        })
+        self._character_pages = MappingProxyType({
+            character["id"]: self._character_page(character) for character in self._lists[CHARACTERS]
+        })
+        self._character_page_bodies = MappingProxyType({
+            character_id: catalog_body(page) for character_id, page in self._character_pages.items()
+        })
+
+    def _recommendation_bundle(self, boss: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "boss": boss,
+            "recommended_characters": self.graph.linked(BOSSES, "recommended_team", boss["id"]),
+            "recommended_builds": self.graph.linked(BOSSES, "recommended_builds", boss["id"]),
+        }
+
+    def _character_page(self, character: Dict[str, Any]) -> Dict[str, Any]:
+        walkthroughs = self.graph.referrers(WALKTHROUGHS, "character", character["id"])
+        return {
+            "character": character,
+            "builds": self.graph.referrers(BUILDS, "character", character["id"]),
+            "walkthrough": walkthroughs[0] if walkthroughs else None,
+            "weapon_passives": self.graph.referrers(WEAPON_PASSIVES, "compatible_characters", character["id"]),
+            "recommended_against": self.graph.referrers(BOSSES, "recommended_team", character["id"]),
+        }
+
+    def list(self, collection: str) -> List[Dict[str, Any]]:
+        return list(self._lists[collection])
+
+    def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        return self._by_key[collection].get(key)
+
+    def list_body(self, collection: str) -> BodyValidator:
+        return self._list_bodies[collection]
+
+    def detail_body(self, collection: str, key: str) -> Optional[BodyValidator]:
+        return self._detail_bodies[collection].get(key)
+
+    def recommendations(self, boss_id: str) -> Optional[Dict[str, Any]]:
+        """The boss joined with its recommended characters and builds."""
+        return self._recommendations.get(boss_id)
+
+    def recommendations_body(self, boss_id: str) -> Optional[BodyValidator]:
+        return self._recommendation_bodies.get(boss_id)
+
+    def character_page(self, character_id: str) -> Optional[Dict[str, Any]]:
+        """The character with its builds, walkthrough, compatible passives and
+        the bosses it is recommended against."""
+        return self._character_pages.get(character_id)
+
+    def character_page_body(self, character_id: str) -> Optional[BodyValidator]:
+        return self._character_page_bodies.get(character_id)
+
+    def bootstrap(self) -> Dict[str, Any]:
+        """Every catalog list in one payload, tagged with the content version."""
+        payload: Dict[str, Any] = {"version": self.version}
+        for collection, docs in self._lists.items():
+            payload[collection] = list(docs)
+        return payload
+
+    def bootstrap_body(self) -> BodyValidator:
+        return self._bootstrap_body
+
+    def index(self, collection: str) -> Mapping[str, Dict[str, Any]]:
+        return self._by_key[collection]
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+
+
+async def load_catalog() -> CatalogSnapshot:
+    results = await asyncio.gather(*(
+        database.find_all(collection, sort=LIST_SORT.get(collection))
+        for collection in CATALOG_COLLECTIONS
+    ))
+    return CatalogSnapshot(dict(zip(CATALOG_COLLECTIONS, results)))
+
+
+async def reload_catalog() -> CatalogSnapshot:
+    """Replace the served snapshot with a fresh read of the catalog collections.
+
+    The similarity index embeds the catalog builds, so it is rebuilt too.
+    """
+    global _snapshot
+    snapshot = await load_catalog()
+    await load_similarity_index(snapshot.list(BUILDS))
+    _snapshot = snapshot
+    for reference in _snapshot.graph.dangling:
+        logger.warning("%s %s: %s refers to unknown %r", reference.source, reference.source_id,
+                       reference.field, reference.name)
+    return _snapshot
+
+
+def get_catalog() -> CatalogSnapshot:
+    if _snapshot is None:
+        raise RuntimeError("Catalog has not been loaded")
+    return _snapshot
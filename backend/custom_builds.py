@@ -0,0 +1,240 @@
+"""Keyset-paginated access to user-submitted custom builds.
+
+custom_builds is the one collection that grows without bound, so lists are
+served newest first in fixed-size pages. The cursor is the (created_at, id)
+of the last build on the previous page, which keeps every page an index
+range scan no matter how deep the client pages.
+
+Identical submissions are stored once. Each build is keyed by a hash of its
+canonical content; resubmitting it bumps submission_count and adds the
+submitter to the build's submitters instead of inserting a copy.
+"""
+import base64
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+import database
+from database import CUSTOM_BUILDS
+from search_index import QUERY_MAX_TIME_MS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Filtered counts stop here; the total is an estimate beyond it
+COUNT_CAP = 10000
+
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
+# Fields needed to render a build card; the detail route returns everything
+SUMMARY_FIELDS = ("id", "name", "character", "type", "description", "primary_weapon", "user_id", "created_at")
+SUMMARY_PROJECTION = {field: 1 for field in SUMMARY_FIELDS}
+
+# Dedupe bookkeeping; who submitted a build is only used for filtering
+PRIVATE_PROJECTION = {"submitters": 0, "content_hash": 0}
+
+# Fixed namespace so a build's id follows from its content hash
+BUILD_ID_NAMESPACE = uuid.UUID("9680fe24-5604-44e7-9674-280e35edad88")
+
+# List fields whose order does not change the build
+UNORDERED_FIELDS = ("talismans", "best_for")
+
+# Stored alongside a build but not part of its content
+BOOKKEEPING_FIELDS = ("id", "user_id", "created_at", "content_hash", "submitters", "submission_count")
+
+
+def _canonical_text(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _canonical_item(value: Any) -> Any:
+    # Legacy builds may hold numbers or objects in their lists; those are
+    # hashed as stored
+    return _canonical_text(value) if isinstance(value, str) else value
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _item_order(value: Any) -> Tuple[int, str]:
+    # Strings sort as they always have, anything else after them
+    return (0, value) if isinstance(value, str) else (1, _encode(value))
+
+
+def canonical_build(document: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a build that make it distinct, with case, whitespace and
+    the order of unordered lists normalised away."""
+    canonical: Dict[str, Any] = {}
+    for field, value in document.items():
+        if field in BOOKKEEPING_FIELDS:
+            continue
+        if isinstance(value, str):
+            value = _canonical_text(value)
+        elif isinstance(value, list):
+            value = [_canonical_item(item) for item in value]
+            if field in UNORDERED_FIELDS:
+                value.sort(key=_item_order)
+        if value not in ("", [], {}):
+            canonical[field] = value
+    return canonical
+
+
+def content_hash(document: Dict[str, Any]) -> str:
+    return hashlib.sha256(_encode(canonical_build(document)).encode("utf-8")).hexdigest()
+
+
+def encode_cursor(build: Dict[str, Any]) -> str:
+    raw = f"{build['created_at'].isoformat()}|{build['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, build_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), build_id
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def build_filter(character: Optional[str] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+    criteria: Dict[str, Any] = {}
+    if character:
+        criteria["character"] = character
+    if user_id:
+        criteria["submitters"] = user_id
+    return criteria
+
+
+async def list_custom_builds(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    character: Optional[str] = None,
+    user_id: Optional[str] = None,
+    summary: bool = True,
+) -> Dict[str, Any]:
+    criteria = build_filter(character, user_id)
+    query = dict(criteria)
+    if cursor:
+        created_at, build_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": build_id}},
+        ]
+
+    # One extra document tells us whether another page exists
+    builds = await database.find_all(
+        CUSTOM_BUILDS,
+        query,
+        sort=PAGE_SORT,
+        limit=limit + 1,
+        projection=SUMMARY_PROJECTION if summary else PRIVATE_PROJECTION,
+        max_time_ms=QUERY_MAX_TIME_MS,
+    )
+    has_more = len(builds) > limit
+    builds = builds[:limit]
+
+    return {
+        "custom_builds": builds,
+        "next_cursor": encode_cursor(builds[-1]) if has_more else None,
+        "total_estimate": await estimate_total(criteria),
+    }
+
+
+async def estimate_total(criteria: Dict[str, Any]) -> int:
+    if not criteria:
+        return await database.estimated_count(CUSTOM_BUILDS)
+    return await database.count(CUSTOM_BUILDS, criteria, limit=COUNT_CAP, maxTimeMS=QUERY_MAX_TIME_MS)
+
+
+async def get_custom_build(build_id: str) -> Optional[Dict[str, Any]]:
+    return await database.find_one(CUSTOM_BUILDS, {"id": build_id}, PRIVATE_PROJECTION)
+
+
+async def store_custom_build(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert a build, or count another submission of an identical one.
+
+    Returns the stored build; its submission_count is 1 for a new build.
+    """
+    build = dict(document)
+    user_id = build.pop("user_id")
+    digest = content_hash(build)
+    query = {"content_hash": digest}
+    update = {
+        "$setOnInsert": {
+            **build,
+            "id": str(uuid.uuid5(BUILD_ID_NAMESPACE, digest)),
+            "content_hash": digest,
+            "user_id": user_id,
+            "created_at": datetime.now(),
+        },
+        "$inc": {"submission_count": 1},
+        "$addToSet": {"submitters": user_id},
+    }
+    try:
+        return await database.find_one_and_update(CUSTOM_BUILDS, query, update, upsert=True)
+    except DuplicateKeyError:
+        # A concurrent submission of the same build inserted it first
+        return await database.find_one_and_update(CUSTOM_BUILDS, query, update)
+
+
+async def backfill_submissions() -> None:
+    """Bring builds stored before deduplication in line with it.
+
+    Each is given its content hash, a submitter list and a count, and
+    identical builds are folded into the oldest copy (or into the build
+    already carrying that hash). Every step is conditional on the legacy
+    document still being unhashed, so workers running this at the same
+    time never count a copy twice.
+    """
+    legacy = await database.find_all(
+        CUSTOM_BUILDS,
+        {"content_hash": {"$exists": False}},
+        sort=[("created_at", 1), ("id", 1)],
+    )
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for build in legacy:
+        try:
+            digest = content_hash(build)
+        except Exception:
+            logger.exception("Skipping custom build %s: its content cannot be hashed", build.get("id"))
+            continue
+        groups.setdefault(digest, []).append(build)
+
+    for digest, builds in groups.items():
+        keeper = await database.find_one(CUSTOM_BUILDS, {"content_hash": digest})
+        if keeper is None:
+            keeper, builds = builds[0], builds[1:]
+            try:
+                await database.update_one(
+                    CUSTOM_BUILDS,
+                    {"id": keeper["id"], "content_hash": {"$exists": False}},
+                    {"$set": {
+                        "content_hash": digest,
+                        "submitters": keeper.get("submitters") or [keeper.get("user_id", "anonymous")],
+                        "submission_count": keeper.get("submission_count", 1),
+                    }},
+                )
+            except DuplicateKeyError:
+                # Another worker hashed a copy first; fold this one into it
+                builds.insert(0, keeper)
+                keeper = await database.find_one(CUSTOM_BUILDS, {"content_hash": digest})
+
+        for duplicate in builds:
+            if not await database.delete_one(
+                CUSTOM_BUILDS, {"id": duplicate["id"], "content_hash": {"$exists": False}}
+            ):
+                continue
+            await database.update_one(CUSTOM_BUILDS, {"id": keeper["id"]}, {
+                "$inc": {"submission_count": duplicate.get("submission_count", 1)},
+                "$addToSet": {"submitters": {"$each": (
+                    duplicate.get("submitters") or [duplicate.get("user_id", "anonymous")]
+                )}},
+            })
@@ -0,0 +1,155 @@
+"""Async MongoDB data-access layer.
+
+Route handlers in server.py go through these coroutines instead of holding
+pymongo collections, so a slow Mongo round-trip only suspends the request
+that issued it rather than the whole event loop.
+"""
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+# Database connection
+MONGO_URL = os.environ.get('MONGO_URL')
+DB_NAME = os.getenv("DB_NAME", "nightreign_guide")
+
+client = AsyncIOMotorClient(MONGO_URL)
+db = client[DB_NAME]
+
+# Collection names
+BOSSES = "bosses"
+CHARACTERS = "characters"
+BUILDS = "builds"
+ACHIEVEMENTS = "achievements"
+WALKTHROUGHS = "walkthroughs"
+USER_RATINGS = "user_ratings"
+CUSTOM_BUILDS = "custom_builds"
+CREATURES = "creatures"
+SECRETS = "secrets"
+WEAPON_SKILLS = "weapon_skills"
+WEAPON_PASSIVES = "weapon_passives"
+METADATA = "metadata"
+BOSS_RATING_STATS = "boss_rating_stats"
+
+# Documents are served without Mongo's internal _id
+PUBLIC_PROJECTION = {"_id": 0}
+
+SortSpec = Sequence[Tuple[str, int]]
+
+
+async def find_all(
+    collection: str,
+    query: Optional[Dict[str, Any]] = None,
+    sort: Optional[SortSpec] = None,
+    max_time_ms: Optional[int] = None,
+    limit: int = 0,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    cursor = db[collection].find(query or {}, {**PUBLIC_PROJECTION, **(projection or {})})
+    if sort:
+        cursor = cursor.sort(list(sort))
+    if limit:
+        cursor = cursor.limit(limit)
+    if max_time_ms:
+        # Server-side budget; exceeding it raises ExecutionTimeout
+        cursor = cursor.max_time_ms(max_time_ms)
+    return await cursor.to_list(length=None)
+
+
+async def find_one(
+    collection: str,
+    query: Dict[str, Any],
+    projection: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    return await db[collection].find_one(query, {**PUBLIC_PROJECTION, **(projection or {})})
+
+
+async def update_one(
+    collection: str,
+    query: Dict[str, Any],
+    update: Dict[str, Any],
+    upsert: bool = False,
+) -> int:
+    """Returns how many documents matched ``query``."""
+    result = await db[collection].update_one(query, update, upsert=upsert)
+    return result.matched_count
+
+
+async def update_many(collection: str, query: Dict[str, Any], update: Any) -> None:
+    await db[collection].update_many(query, update)
+
+
+async def find_one_and_update(
+    collection: str,
+    query: Dict[str, Any],
+    update: Dict[str, Any],
+    upsert: bool = False,
+    return_updated: bool = True,
+) -> Optional[Dict[str, Any]]:
+    return await db[collection].find_one_and_update(
+        query,
+        update,
+        projection=PUBLIC_PROJECTION,
+        upsert=upsert,
+        return_document=ReturnDocument.AFTER if return_updated else ReturnDocument.BEFORE,
+    )
+
+
+async def bulk_write(collection: str, operations: List[Any]) -> None:
+    if operations:
+        await db[collection].bulk_write(operations, ordered=False)
+
+
+async def aggregate(collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return await db[collection].aggregate(pipeline).to_list(length=None)
+
+
+async def count(collection: str, query: Optional[Dict[str, Any]] = None, **kwargs) -> int:
+    return await db[collection].count_documents(query or {}, **kwargs)
+
+
+async def estimated_count(collection: str) -> int:
+    # Read from collection metadata, no scan
+    return await db[collection].estimated_document_count()
+
+
+async def delete_one(collection: str, query: Dict[str, Any]) -> int:
+    """Returns how many documents were deleted."""
+    result = await db[collection].delete_one(query)
+    return result.deleted_count
+
+
+async def replace_collection(
+    collection: str,
+    documents: List[Dict[str, Any]],
+    prepare: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> None:
+    """Swap in a new set of documents without an empty window for readers.
+
+    Documents are written to a staging collection that is then renamed over
+    the live one, so concurrent reads see either the old or the new data.
+    The rename drops the live collection's indexes; ``prepare`` is awaited
+    with the staging collection's name before the swap to build them.
+    """
+    staging = db[f"{collection}__staging"]
+    await staging.drop()
+    if not documents:
+        await db[collection].delete_many({})
+        return
+    await staging.insert_many(documents)
+    if prepare is not None:
+        await prepare(staging.name)
+    await staging.rename(collection, dropTarget=True)
+
+
+async def create_index(collection: str, keys: SortSpec, **kwargs) -> str:
+    return await db[collection].create_index(list(keys), **kwargs)
+
+
+async def index_information(collection: str) -> Dict[str, Dict[str, Any]]:
+    return await db[collection].index_information()
+
+
+def close() -> None:
+    client.close()
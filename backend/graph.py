@@ -0,0 +1,109 @@
+"""Cross-references between catalog entities, resolved once per snapshot.
+
+Seed documents refer to each other by display name ("recommended_team":
+["Wylder", ...]). CatalogGraph resolves every such reference to an id when
+the catalog is loaded and keeps both directions of each edge, so "which
+builds does this boss recommend" and "which bosses recommend this build"
+are both a dict lookup. Names that resolve to nothing are collected as
+dangling references rather than silently dropped.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    WALKTHROUGHS,
+    WEAPON_PASSIVES,
+)
+
+
+class Reference(NamedTuple):
+    source: str
+    field: str
+    target: str
+
+
+REFERENCES = (
+    Reference(BOSSES, "recommended_team", CHARACTERS),
+    Reference(BOSSES, "recommended_builds", BUILDS),
+    Reference(CHARACTERS, "recommended_builds", BUILDS),
+    Reference(BUILDS, "character", CHARACTERS),
+    Reference(BUILDS, "best_for", CHARACTERS),
+    Reference(WEAPON_PASSIVES, "compatible_characters", CHARACTERS),
+    Reference(WALKTHROUGHS, "character", CHARACTERS),
+)
+
+REFERENCES_BY_FIELD = {(reference.source, reference.field): reference for reference in REFERENCES}
+
+
+class DanglingReference(NamedTuple):
+    source: str
+    source_id: str
+    field: str
+    name: str
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _referenced_names(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    return [item for item in value or () if isinstance(item, str)]
+
+
+class CatalogGraph:
+    """Forward and reverse id edges for every field in REFERENCES."""
+
+    def __init__(self, documents: Mapping[str, Iterable[Dict[str, Any]]]):
+        self._by_id: Dict[str, Dict[str, Dict[str, Any]]] = {
+            collection: {document["id"]: document for document in documents.get(collection, ())}
+            for collection in {reference.source for reference in REFERENCES}
+            | {reference.target for reference in REFERENCES}
+        }
+        ids_by_name = {
+            collection: {_normalize_name(document["name"]): document["id"]
+                         for document in docs.values() if document.get("name")}
+            for collection, docs in self._by_id.items()
+        }
+
+        self._links: Dict[Reference, Dict[str, Tuple[str, ...]]] = {}
+        self._backlinks: Dict[Reference, Dict[str, Tuple[str, ...]]] = {}
+        self.dangling: List[DanglingReference] = []
+        for reference in REFERENCES:
+            names = ids_by_name[reference.target]
+            links: Dict[str, Tuple[str, ...]] = {}
+            backlinks: Dict[str, List[str]] = {}
+            for source_id, document in self._by_id[reference.source].items():
+                targets: List[str] = []
+                for name in _referenced_names(document.get(reference.field)):
+                    target_id = names.get(_normalize_name(name))
+                    if target_id is None:
+                        self.dangling.append(DanglingReference(reference.source, source_id, reference.field, name))
+                    elif target_id not in targets:
+                        targets.append(target_id)
+                        backlinks.setdefault(target_id, []).append(source_id)
+                links[source_id] = tuple(targets)
+            self._links[reference] = links
+            self._backlinks[reference] = {target_id: tuple(ids) for target_id, ids in backlinks.items()}
+
+    @staticmethod
+    def _reference(source: str, field: str) -> Reference:
+        return REFERENCES_BY_FIELD[(source, field)]
+
+    def linked_ids(self, source: str, field: str, source_id: str) -> Tuple[str, ...]:
+        """Ids ``source_id`` refers to through ``field``, in the order it names them."""
+        return self._links[self._reference(source, field)].get(source_id, ())
+
+    def referrer_ids(self, source: str, field: str, target_id: str) -> Tuple[str, ...]:
+        """Ids of ``source`` documents whose ``field`` refers to ``target_id``."""
+        return self._backlinks[self._reference(source, field)].get(target_id, ())
+
+    def linked(self, source: str, field: str, source_id: str) -> List[Dict[str, Any]]:
+        target = self._reference(source, field).target
+        return [self._by_id[target][target_id] for target_id in self.linked_ids(source, field, source_id)]
+
+    def referrers(self, source: str, field: str, target_id: str) -> List[Dict[str, Any]]:
+        return [self._by_id[source][source_id] for source_id in self.referrer_ids(source, field, target_id)]
@@ -0,0 +1,157 @@
+"""Declared MongoDB indexes for every query the API issues.
+
+ensure_indexes() creates anything missing at startup (create_index is a
+no-op for existing indexes) and report_missing_indexes() logs whatever is
+still absent afterwards, e.g. a unique index blocked by duplicate data.
+Collections replaced wholesale get their indexes built on the staging copy
+before the swap, since the rename discards the live collection's.
+"""
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pymongo.errors import OperationFailure
+
+import database
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    ACHIEVEMENTS,
+    WALKTHROUGHS,
+    USER_RATINGS,
+    CUSTOM_BUILDS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+    BOSS_RATING_STATS,
+)
+
+logger = logging.getLogger(__name__)
+
+# "false" only reports missing indexes, e.g. when they are managed by a DBA
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
+
+IndexKeys = Sequence[Tuple[str, Any]]
+
+
+def index(
+    *keys: Tuple[str, Any],
+    unique: bool = False,
+    partial: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    return {"keys": list(keys), "unique": unique, "partial": partial}
+
+
+UNIQUE_ID = index(("id", 1), unique=True)
+
+INDEXES: Dict[str, List[Dict[str, Any]]] = {
+    # Detail routes, filter-bosses and the recommendation name lookups
+    BOSSES: [
+        UNIQUE_ID,
+        index(("difficulty_rating", 1)),
+        index(("weaknesses", 1)),
+        index(("name", "text"), ("description", "text")),
+    ],
+    CHARACTERS: [
+        UNIQUE_ID,
+        index(("name", 1)),
+        index(("name", "text"), ("description", "text")),
+    ],
+    BUILDS: [
+        UNIQUE_ID,
+        index(("name", 1)),
+        index(("name", "text"), ("description", "text")),
+    ],
+    ACHIEVEMENTS: [
+        UNIQUE_ID,
+        index(("rank", 1)),
+        index(("name", "text"), ("description", "text")),
+    ],
+    WALKTHROUGHS: [
+        UNIQUE_ID,
+        index(("character", 1), unique=True),
+    ],
+    CREATURES: [
+        UNIQUE_ID,
+        index(("weaknesses", 1)),
+        index(("name", "text"), ("description", "text"), ("type", "text")),
+    ],
+    SECRETS: [
+        UNIQUE_ID,
+        index(("name", "text"), ("description", "text"), ("category", "text")),
+    ],
+    WEAPON_SKILLS: [
+        UNIQUE_ID,
+        index(("name", "text"), ("description", "text"), ("category", "text")),
+    ],
+    WEAPON_PASSIVES: [
+        UNIQUE_ID,
+        index(("name", "text"), ("description", "text"), ("category", "text")),
+    ],
+    # One rating per user and boss; per-boss reads and the stats backfill
+    USER_RATINGS: [
+        index(("user_id", 1), ("boss_id", 1), unique=True),
+        index(("boss_id", 1)),
+    ],
+    BOSS_RATING_STATS: [
+        index(("boss_id", 1), unique=True),
+    ],
+    # Keyset pages, newest first, optionally filtered by character or user;
+    # builds stored before deduplication have no content_hash
+    CUSTOM_BUILDS: [
+        UNIQUE_ID,
+        index(("content_hash", 1), unique=True, partial={"content_hash": {"$exists": True}}),
+        index(("created_at", -1), ("id", -1)),
+        index(("character", 1), ("created_at", -1), ("id", -1)),
+        index(("submitters", 1), ("created_at", -1), ("id", -1)),
+    ],
+}
+
+
+def index_name(keys: IndexKeys) -> str:
+    # Same naming scheme as pymongo's default
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+async def create_indexes(collection: str, target: Optional[str] = None) -> None:
+    """Create the indexes declared for ``collection`` on it, or on ``target``,
+    e.g. a staging copy that is about to replace it."""
+    target = target or collection
+    for spec in INDEXES.get(collection, ()):
+        options = {"partialFilterExpression": spec["partial"]} if spec["partial"] else {}
+        try:
+            await database.create_index(
+                target,
+                spec["keys"],
+                name=index_name(spec["keys"]),
+                unique=spec["unique"],
+                **options,
+            )
+        except OperationFailure as e:
+            logger.error("Could not create index %s on %s: %s",
+                         index_name(spec["keys"]), target, e)
+
+
+async def ensure_indexes() -> None:
+    for collection in INDEXES:
+        await create_indexes(collection)
+
+
+async def find_missing_indexes() -> Dict[str, List[str]]:
+    missing: Dict[str, List[str]] = {}
+    for collection, specs in INDEXES.items():
+        existing = await database.index_information(collection)
+        for spec in specs:
+            name = index_name(spec["keys"])
+            if name not in existing:
+                missing.setdefault(collection, []).append(name)
+    return missing
+
+
+async def report_missing_indexes() -> Dict[str, List[str]]:
+    missing = await find_missing_indexes()
+    for collection, names in missing.items():
+        logger.warning("Missing indexes on %s: %s", collection, ", ".join(names))
+    return missing
@@ -0,0 +1,33 @@
+"""Request models for user-submitted content."""
+from typing import Annotated, Any, Dict, List, Literal, get_args
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+ShortText = Annotated[str, StringConstraints(strip_whitespace=True, max_length=100)]
+LongText = Annotated[str, StringConstraints(strip_whitespace=True, max_length=1000)]
+
+StatName = Literal["Vigor", "Mind", "Endurance", "Strength", "Dexterity", "Intelligence", "Faith", "Arcane"]
+STAT_NAMES = get_args(StatName)
+
+
+class CustomBuildCreate(BaseModel):
+    """A custom build, mirroring the seed ``builds`` schema with size limits."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+    character: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=50)]
+    type: ShortText = ""
+    description: LongText = ""
+    primary_weapon: ShortText = ""
+    secondary_weapon: ShortText = ""
+    armor_set: ShortText = ""
+    talismans: List[ShortText] = Field(default_factory=list, max_length=6)
+    recommended_stats: Dict[StatName, Annotated[int, Field(ge=0, le=99)]] = Field(default_factory=dict)
+    strategy: LongText = ""
+    best_for: List[ShortText] = Field(default_factory=list, max_length=10)
+    user_id: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=64)] = "anonymous"
+
+    def to_document(self) -> Dict[str, Any]:
+        # Empty optional fields are left out of the stored document
+        return {**self.model_dump(exclude_defaults=True), "user_id": self.user_id}
@@ -0,0 +1,171 @@
+"""Optional write-behind queue for rating submissions.
+
+With RATING_WRITE_BEHIND enabled, /api/rate-boss validates the boss against
+the catalog, queues the vote and returns. Votes are coalesced per
+(user, boss) and flushed on a timer or once the batch is full: one read
+fetches the ratings being replaced, then one bulk_write stores the ratings
+and one more applies the summed $inc to each boss's aggregate. Pending
+votes are flushed on graceful shutdown.
+
+Each stored rating is conditional on the counted_rating read for it, so
+when two workers flush the same (user, boss), e.g. two anonymous votes,
+only one of them counts the change; the other's upsert collides on the
+unique (user_id, boss_id) index and its vote is queued again to be re-read.
+Increments of stored ratings are kept until their aggregate update
+succeeds, and only the aggregates whose update failed are retried.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+import database
+from database import BOSS_RATING_STATS, USER_RATINGS
+from ratings import counted_rating, rating_increments
+
+logger = logging.getLogger(__name__)
+
+RATING_WRITE_BEHIND = os.getenv("RATING_WRITE_BEHIND", "false").lower() == "true"
+RATING_FLUSH_INTERVAL_SECONDS = float(os.getenv("RATING_FLUSH_INTERVAL_SECONDS", "1.0"))
+RATING_FLUSH_BATCH_SIZE = int(os.getenv("RATING_FLUSH_BATCH_SIZE", "500"))
+
+# (user_id, boss_id) -> (rating, submitted at)
+PendingRatings = Dict[Tuple[str, str], Tuple[int, datetime]]
+
+DUPLICATE_KEY = 11000
+
+
+async def _failed_operations(collection: str, operations: List[Any]) -> Set[int]:
+    """Positions of the operations that failed; errors not tied to an
+    operation propagate."""
+    try:
+        await database.bulk_write(collection, operations)
+    except BulkWriteError as e:
+        if e.details.get("writeConcernErrors"):
+            raise
+        errors = e.details.get("writeErrors", [])
+        for error in errors:
+            if error.get("code") != DUPLICATE_KEY:
+                logger.warning("Buffered write to %s failed: %s", collection, error.get("errmsg"))
+        return {error["index"] for error in errors}
+    return set()
+
+
+class RatingBuffer:
+    def __init__(
+        self,
+        flush_interval: float = RATING_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = RATING_FLUSH_BATCH_SIZE,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: PendingRatings = {}
+        # boss_id -> $inc of stored ratings not yet in the boss's aggregate
+        self._unapplied: Dict[str, Dict[str, int]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._batch_full = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, boss_id: str, user_id: str, rating: int) -> None:
+        # A later vote by the same user replaces the queued one
+        self._pending[(user_id, boss_id)] = (rating, datetime.now())
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let an in-flight flush finish rather than cancelling it mid-write
+            self._stopping.set()
+            self._batch_full.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing buffered ratings failed; will retry")
+
+    async def flush(self) -> int:
+        """Write every pending vote; returns how many were stored."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch and not self._unapplied:
+                return 0
+            try:
+                retry = await self._store(batch) if batch else []
+            except BaseException:
+                # Put the batch back without clobbering votes queued meanwhile
+                self._requeue(batch)
+                raise
+            self._requeue({key: batch[key] for key in retry})
+            await self._apply_increments()
+            return len(batch) - len(retry)
+
+    def _requeue(self, batch: PendingRatings) -> None:
+        for key, value in batch.items():
+            self._pending.setdefault(key, value)
+
+    async def _store(self, batch: PendingRatings) -> List[Tuple[str, str]]:
+        """Store the batch's ratings and note their increments; returns the
+        keys another worker counted a vote for since they were read."""
+        keys = list(batch)
+        existing = await database.find_all(USER_RATINGS, {"$or": [
+            {"user_id": user_id, "boss_id": boss_id} for user_id, boss_id in keys
+        ]})
+        stored = {(doc["user_id"], doc["boss_id"]): doc for doc in existing}
+
+        operations = []
+        for user_id, boss_id in keys:
+            rating, timestamp = batch[(user_id, boss_id)]
+            read = stored.get((user_id, boss_id), {})
+            operations.append(UpdateOne(
+                # Matches only while counted_rating is still what was read
+                {"user_id": user_id, "boss_id": boss_id, "counted_rating": read.get("counted_rating")},
+                {"$set": {"rating": rating, "timestamp": timestamp, "counted_rating": rating}},
+                upsert=True,
+            ))
+        failed = await _failed_operations(USER_RATINGS, operations)
+
+        for position, key in enumerate(keys):
+            if position in failed:
+                continue
+            previous = counted_rating(stored[key]) if key in stored else None
+            boss_increments = self._unapplied.setdefault(key[1], {})
+            for field, amount in rating_increments(previous, batch[key][0]).items():
+                boss_increments[field] = boss_increments.get(field, 0) + amount
+        return [keys[position] for position in sorted(failed)]
+
+    async def _apply_increments(self) -> None:
+        boss_ids = [boss_id for boss_id, increments in self._unapplied.items() if increments]
+        failed = await _failed_operations(BOSS_RATING_STATS, [
+            UpdateOne({"boss_id": boss_id}, {"$inc": self._unapplied[boss_id]}, upsert=True)
+            for boss_id in boss_ids
+        ])
+        # Only the failed aggregates are retried, so no $inc is applied twice
+        self._unapplied = {boss_ids[position]: self._unapplied[boss_ids[position]] for position in failed}
+        if failed:
+            raise RuntimeError(f"Updating {len(failed)} rating aggregates failed; will retry")
+
+
+rating_buffer = RatingBuffer()
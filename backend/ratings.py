@@ -0,0 +1,204 @@
+"""Per-boss rating aggregates maintained incrementally.
+
+Every vote applies an $inc to the boss's sum, count and histogram, taking
+into account the rating it replaces, so submitting a rating costs O(1)
+regardless of how many ratings the boss already has.
+
+Each user_ratings document also records counted_rating, the rating the
+aggregate currently includes (None when it includes none). The $inc is
+derived from counted_rating rather than from the rating being replaced, so
+a vote whose aggregate update failed is counted by the next attempt instead
+of being stored but never counted. Should the aggregates drift anyway, e.g.
+after a crash between the two writes, start once with
+REBUILD_RATING_STATS=true to recompute them from user_ratings. Votes taken
+by other workers while a rebuild runs can be lost, so workers starting
+together let one of them rebuild under a metadata lock and wait for it.
+"""
+import functools
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+import database
+from database import BOSS_RATING_STATS, USER_RATINGS
+from indexes import create_indexes
+from seeding import acquire_lock, release_lock, wait_for_release
+
+logger = logging.getLogger(__name__)
+
+REBUILD_RATING_STATS = os.getenv("REBUILD_RATING_STATS", "false").lower() == "true"
+
+# Metadata lock held by the worker rebuilding the aggregates
+REBUILD_LOCK_ID = "rating_stats_lock"
+
+MIN_RATING = 1
+MAX_RATING = 10
+
+
+def empty_stats(boss_id: str) -> Dict[str, Any]:
+    return {
+        "boss_id": boss_id,
+        "sum": 0,
+        "count": 0,
+        "histogram": {str(rating): 0 for rating in range(MIN_RATING, MAX_RATING + 1)},
+    }
+
+
+def rating_increments(previous: Optional[int], rating: int) -> Dict[str, int]:
+    """$inc document turning a boss's aggregate from ``previous`` to ``rating``."""
+    if previous is None:
+        return {"sum": rating, "count": 1, f"histogram.{rating}": 1}
+    if previous == rating:
+        return {}
+    return {
+        "sum": rating - previous,
+        f"histogram.{previous}": -1,
+        f"histogram.{rating}": 1,
+    }
+
+
+def counted_rating(user_rating: Dict[str, Any]) -> Optional[int]:
+    # Ratings stored before counted_rating existed are included in the aggregate
+    return user_rating.get("counted_rating", user_rating["rating"])
+
+
+def average_rating(stats: Dict[str, Any]) -> float:
+    return round(stats["sum"] / stats["count"], 1) if stats.get("count") else 0.0
+
+
+def rating_summary(stats: Dict[str, Any], boss: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a boss's aggregate, with every histogram bucket present."""
+    histogram = stats.get("histogram", {})
+    return {
+        "boss_id": boss["id"],
+        "boss_name": boss["name"],
+        "average_rating": average_rating(stats),
+        "total_ratings": stats.get("count", 0),
+        "distribution": {
+            str(rating): histogram.get(str(rating), 0)
+            for rating in range(MIN_RATING, MAX_RATING + 1)
+        },
+    }
+
+
+async def get_all_rating_stats() -> Dict[str, Dict[str, Any]]:
+    stats = await database.find_all(BOSS_RATING_STATS)
+    return {boss_stats["boss_id"]: boss_stats for boss_stats in stats}
+
+
+async def get_rating_stats(boss_id: str) -> Dict[str, Any]:
+    stats = await database.find_one(BOSS_RATING_STATS, {"boss_id": boss_id})
+    return stats or empty_stats(boss_id)
+
+
+async def apply_rating_change(boss_id: str, previous: Optional[int], rating: int) -> Dict[str, Any]:
+    increments = rating_increments(previous, rating)
+    if not increments:
+        return await get_rating_stats(boss_id)
+    return await database.find_one_and_update(
+        BOSS_RATING_STATS,
+        {"boss_id": boss_id},
+        {"$inc": increments},
+        upsert=True,
+    )
+
+
+async def record_rating(boss_id: str, user_id: str, rating: int) -> Dict[str, Any]:
+    """Store a user's rating and return the boss's updated aggregate."""
+    query = {"user_id": user_id, "boss_id": boss_id}
+    update = {
+        "$set": {"rating": rating, "timestamp": datetime.now()},
+        "$setOnInsert": {"counted_rating": None},
+    }
+    try:
+        await database.update_one(USER_RATINGS, query, update, upsert=True)
+    except DuplicateKeyError:
+        # A concurrent first vote by the same user won the upsert; update it instead
+        await database.update_one(USER_RATINGS, query, update)
+    return await apply_pending_rating(boss_id, user_id)
+
+
+async def apply_pending_rating(boss_id: str, user_id: str) -> Dict[str, Any]:
+    """Bring the boss's aggregate in line with the user's stored rating.
+
+    counted_rating is claimed before the $inc, so concurrent callers never
+    apply the same change twice, and restored if the $inc fails, so a retry
+    applies it.
+    """
+    query = {"user_id": user_id, "boss_id": boss_id}
+    while True:
+        stored = await database.find_one(USER_RATINGS, query)
+        rating, counted = stored["rating"], counted_rating(stored)
+        if counted == rating:
+            return await get_rating_stats(boss_id)
+        claim = {**query, "rating": rating, "counted_rating": counted}
+        if await database.update_one(USER_RATINGS, claim, {"$set": {"counted_rating": rating}}):
+            break
+
+    try:
+        return await apply_rating_change(boss_id, counted, rating)
+    except Exception:
+        try:
+            await database.update_one(
+                USER_RATINGS,
+                {**query, "counted_rating": rating},
+                {"$set": {"counted_rating": counted}},
+            )
+        except Exception:
+            logger.exception("Rating of %s by %s is stored but not counted; "
+                             "restart with REBUILD_RATING_STATS=true to repair", boss_id, user_id)
+        raise
+
+
+async def rebuild_rating_stats() -> List[Dict[str, Any]]:
+    """Recompute every aggregate from user_ratings, e.g. to backfill existing data."""
+    rows = await database.aggregate(USER_RATINGS, [
+        {"$group": {"_id": {"boss_id": "$boss_id", "rating": "$rating"}, "count": {"$sum": 1}}},
+    ])
+    stats: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        boss_id, rating, count = row["_id"]["boss_id"], row["_id"]["rating"], row["count"]
+        boss_stats = stats.setdefault(boss_id, empty_stats(boss_id))
+        boss_stats["sum"] += rating * count
+        boss_stats["count"] += count
+        boss_stats["histogram"][str(rating)] = count
+    documents = list(stats.values())
+    await database.replace_collection(
+        BOSS_RATING_STATS,
+        documents,
+        prepare=functools.partial(create_indexes, BOSS_RATING_STATS),
+    )
+    await database.update_many(USER_RATINGS, {}, [{"$set": {"counted_rating": "$rating"}}])
+    return documents
+
+
+async def _needs_rebuild() -> bool:
+    # Ratings recorded before aggregates existed need a one-off backfill
+    return REBUILD_RATING_STATS or (
+        await database.count(BOSS_RATING_STATS) == 0 and await database.count(USER_RATINGS) > 0
+    )
+
+
+async def ensure_rating_stats() -> None:
+    if await _needs_rebuild():
+        owner = uuid.uuid4().hex
+        if await acquire_lock(REBUILD_LOCK_ID, owner):
+            try:
+                # Another worker may have rebuilt them while we were acquiring the lock
+                if await _needs_rebuild():
+                    await rebuild_rating_stats()
+            finally:
+                await release_lock(REBUILD_LOCK_ID, owner)
+        else:
+            # Take no votes until the worker holding the lock is done
+            await wait_for_release(REBUILD_LOCK_ID)
+    # Ratings stored before counted_rating existed are already in the aggregates
+    await database.update_many(
+        USER_RATINGS,
+        {"counted_rating": {"$exists": False}},
+        [{"$set": {"counted_rating": "$rating"}}],
+    )
@@ -0,0 +1,170 @@
+"""Pre-encoded JSON response bodies.
+
+Payloads that only change when the catalog is reloaded are encoded to bytes
+(and optionally compressed) once, then returned as raw Responses without
+going through jsonable_encoder on every request. Each body carries a strong
+ETag derived from its content, so conditional requests get a 304. With
+PRESERIALIZED_RESPONSES off only that validator is kept and the body is
+encoded per request, with the same ETag and Cache-Control headers.
+"""
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+PRESERIALIZED_RESPONSES = os.getenv("PRESERIALIZED_RESPONSES", "true").lower() == "true"
+COMPRESS_RESPONSES = os.getenv("COMPRESS_RESPONSES", "true").lower() == "true"
+
+# Bodies smaller than this are not worth compressing
+COMPRESSION_MIN_BYTES = 1024
+
+
+def _parse_max_age_overrides(value: str) -> Dict[str, int]:
+    # "/api/walkthroughs=3600,/api/bosses/{boss_id}=600"
+    overrides = {}
+    for item in value.split(","):
+        route, _, seconds = item.strip().rpartition("=")
+        if route and seconds.isdigit():
+            overrides[route] = int(seconds)
+    return overrides
+
+
+# Cache-Control max-age for catalog responses, overridable per route path
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "60"))
+CACHE_MAX_AGE_OVERRIDES = _parse_max_age_overrides(os.getenv("CACHE_MAX_AGE_OVERRIDES", ""))
+
+
+def encode_json(content: Any) -> bytes:
+    # Same settings as FastAPI's JSONResponse
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+class BodyValidator:
+    """The strong validator of a JSON body whose bytes are not kept."""
+
+    __slots__ = ("digest",)
+
+    def __init__(self, content: Any):
+        self.digest = _digest(encode_json(content))
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        # Each content-coding is a distinct representation with its own tag
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+class EncodedBody(BodyValidator):
+    """A JSON body encoded once, with precompressed variants when useful."""
+
+    __slots__ = ("raw", "gzip", "br")
+
+    def __init__(self, content: Any):
+        self.raw = encode_json(content)
+        self.digest = _digest(self.raw)
+        self.gzip: Optional[bytes] = None
+        self.br: Optional[bytes] = None
+        if COMPRESS_RESPONSES and len(self.raw) >= COMPRESSION_MIN_BYTES:
+            self.gzip = gzip.compress(self.raw, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.br = brotli.compress(self.raw)
+
+
+def catalog_body(content: Any) -> BodyValidator:
+    """What a catalog snapshot keeps for one payload."""
+    return EncodedBody(content) if PRESERIALIZED_RESPONSES else BodyValidator(content)
+
+
+def _accepted_encodings(request: Request) -> Set[str]:
+    accepted = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def _etag_matches(request: Request, body: BodyValidator) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    current = (body.etag(), body.etag("gzip"), body.etag("br"))
+    for tag in header.split(","):
+        tag = tag.strip()
+        # If-None-Match uses weak comparison
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag in current:
+            return True
+    return False
+
+
+def cache_control(request: Request) -> str:
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    max_age = CACHE_MAX_AGE_OVERRIDES.get(path, CACHE_MAX_AGE)
+    return f"public, max-age={max_age}"
+
+
+def encoded_response(
+    body: EncodedBody,
+    request: Request,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    response_headers = {"Vary": "Accept-Encoding", "Cache-Control": cache_control(request)}
+    if headers:
+        response_headers.update(headers)
+
+    content = body.raw
+    encoding = None
+    accepted = _accepted_encodings(request)
+    if body.br is not None and "br" in accepted:
+        content, encoding = body.br, "br"
+    elif body.gzip is not None and "gzip" in accepted:
+        content, encoding = body.gzip, "gzip"
+    response_headers["ETag"] = body.etag(encoding)
+
+    if _etag_matches(request, body):
+        return Response(status_code=304, headers=response_headers)
+
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=response_headers)
+
+
+def validated_response(body: BodyValidator, request: Request, content: Callable[[], Any]) -> Response:
+    """Send ``content()`` with the caching headers encoded_response would set.
+
+    The content is only built when it is sent, not for a 304.
+    """
+    headers = {"Cache-Control": cache_control(request), "ETag": body.etag()}
+    if _etag_matches(request, body):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content(), headers=headers)
+
+
+def body_response(body: BodyValidator, request: Request, content: Callable[[], Any]) -> Response:
+    """encoded_response for a pre-encoded body, validated_response otherwise;
+    ``content`` is only called for the latter."""
+    if isinstance(body, EncodedBody):
+        return encoded_response(body, request)
+    return validated_response(body, request, content)
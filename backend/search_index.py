@@ -0,0 +1,270 @@
+"""In-memory inverted index behind /api/search.
+
+Built once per catalog snapshot over the same fields the Mongo search
+scanned with regexes. Every query token is matched as a word prefix, and a
+document matches when all query tokens do. Matches are ranked: name hits
+outweigh hits in other fields, which outweigh description hits, and an
+exact token beats a prefix. The whole query matching the name exactly, as
+a prefix or as a substring earns a further bonus in that order.
+
+Fuzzy queries expand each token to the vocabulary tokens sharing the most
+trigrams with it (Dice similarity), so typos still find their documents.
+"""
+import os
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    ACHIEVEMENTS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+
+# "index" serves search from memory, "mongo" keeps the per-collection queries
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "index")
+
+# Longest search or filter string accepted from clients
+MAX_QUERY_LENGTH = int(os.getenv("MAX_QUERY_LENGTH", "100"))
+
+# Server-side time budget for each Mongo query issued by search and filters
+QUERY_MAX_TIME_MS = int(os.getenv("QUERY_MAX_TIME_MS", "500"))
+
+# Searchable fields per collection, in response order
+SEARCH_FIELDS = {
+    BOSSES: ("name", "description", "weaknesses", "damage_types"),
+    CHARACTERS: ("name", "description", "abilities", "playstyle"),
+    BUILDS: ("name", "description", "character", "type"),
+    ACHIEVEMENTS: ("name", "description", "category"),
+    CREATURES: ("name", "description", "type", "location", "weaknesses"),
+    SECRETS: ("name", "description", "category", "location"),
+    WEAPON_SKILLS: ("name", "description", "category", "usable_with"),
+    WEAPON_PASSIVES: ("name", "description", "category", "compatible_characters"),
+}
+
+# Default and largest page size for ranked results
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 200
+
+# Weight of a token hit by field; fields not listed weigh DEFAULT_FIELD_WEIGHT
+FIELD_WEIGHTS = {"name": 10.0, "description": 1.0}
+DEFAULT_FIELD_WEIGHT = 3.0
+PREFIX_MATCH_FACTOR = 0.6
+
+# Bonus when the whole query matches the name
+NAME_EXACT_BONUS = 100.0
+NAME_PREFIX_BONUS = 50.0
+NAME_SUBSTRING_BONUS = 25.0
+
+# Fuzzy matching: minimum trigram similarity for a vocabulary token to count,
+# and how many similar tokens each query token may expand to
+FUZZY_MIN_SIMILARITY = 0.45
+FUZZY_MAX_EXPANSIONS = 25
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"$${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def display_name(document: Dict[str, Any]) -> str:
+    return document.get("name") or document.get("title") or ""
+
+
+RankedResult = Tuple[float, str, Dict[str, Any]]
+
+
+class SearchIndex:
+    """Token -> weighted document postings with prefix lookup over a sorted vocabulary."""
+
+    def __init__(self, documents: Dict[str, Iterable[Dict[str, Any]]]):
+        # Documents are numbered globally; numbering follows collection order
+        self._documents: List[Tuple[str, Dict[str, Any]]] = []
+        self._names: List[str] = []
+        postings: Dict[str, Dict[int, float]] = {}
+        for collection, fields in SEARCH_FIELDS.items():
+            for document in documents.get(collection, ()):
+                doc_no = len(self._documents)
+                self._documents.append((collection, document))
+                self._names.append(" ".join(tokenize(display_name(document))))
+                for field in fields:
+                    weight = FIELD_WEIGHTS.get(field, DEFAULT_FIELD_WEIGHT)
+                    for token in tokenize(field_text(document.get(field))):
+                        doc_weights = postings.setdefault(token, {})
+                        if weight > doc_weights.get(doc_no, 0.0):
+                            doc_weights[doc_no] = weight
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+        # Trigram -> vocabulary positions, for fuzzy lookups
+        self._trigram_postings: Dict[str, List[int]] = {}
+        self._trigram_counts: List[int] = []
+        for position, token in enumerate(self._vocabulary):
+            grams = trigrams(token)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_postings.setdefault(gram, []).append(position)
+
+    def _token_scores(self, query_token: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        position = bisect_left(self._vocabulary, query_token)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(query_token):
+            token = self._vocabulary[position]
+            factor = 1.0 if token == query_token else PREFIX_MATCH_FACTOR
+            for doc_no, weight in self._postings[token].items():
+                if weight * factor > scores.get(doc_no, 0.0):
+                    scores[doc_no] = weight * factor
+            position += 1
+        return scores
+
+    def _similar_tokens(self, query_token: str) -> List[Tuple[float, str]]:
+        grams = trigrams(query_token)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._trigram_postings.get(gram, ()))
+        candidates = []
+        for position, count in shared.items():
+            similarity = 2.0 * count / (len(grams) + self._trigram_counts[position])
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                candidates.append((similarity, self._vocabulary[position]))
+        return heapq.nlargest(FUZZY_MAX_EXPANSIONS, candidates)
+
+    def _fuzzy_token_scores(self, query_token: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for similarity, token in self._similar_tokens(query_token):
+            for doc_no, weight in self._postings[token].items():
+                if weight * similarity > scores.get(doc_no, 0.0):
+                    scores[doc_no] = weight * similarity
+        return scores
+
+    def _name_bonus(self, doc_no: int, phrase: str) -> float:
+        name = self._names[doc_no]
+        if name == phrase:
+            return NAME_EXACT_BONUS
+        if name.startswith(phrase):
+            return NAME_PREFIX_BONUS
+        if phrase in name:
+            return NAME_SUBSTRING_BONUS
+        return 0.0
+
+    def rank(self, query: str, match_all: bool = True) -> List[RankedResult]:
+        """Score documents for ``query``, best first.
+
+        With ``match_all`` only documents matching every query token are
+        returned; otherwise every indexed document is scored.
+        """
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not tokens and match_all:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        if not match_all:
+            scores = {doc_no: 0.0 for doc_no in range(len(self._documents))}
+        # Most selective (longest) tokens first keeps the intersection small
+        for token in tokens:
+            token_scores = self._token_scores(token)
+            if scores is None:
+                scores = token_scores
+            elif match_all:
+                scores = {doc_no: score + token_scores[doc_no]
+                          for doc_no, score in scores.items() if doc_no in token_scores}
+            else:
+                for doc_no, score in token_scores.items():
+                    scores[doc_no] += score
+            if not scores:
+                return []
+
+        phrase = " ".join(tokenize(query))
+        ranked = sorted(
+            ((score + self._name_bonus(doc_no, phrase), doc_no) for doc_no, score in scores.items()),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return [(score, *self._documents[doc_no]) for score, doc_no in ranked]
+
+    def rank_fuzzy(self, query: str) -> List[RankedResult]:
+        """Score documents by trigram similarity; every query token must match something."""
+        scores: Optional[Dict[int, float]] = None
+        for token in set(tokenize(query)):
+            token_scores = self._fuzzy_token_scores(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_no: score + token_scores[doc_no]
+                          for doc_no, score in scores.items() if doc_no in token_scores}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, *self._documents[doc_no]) for doc_no, score in ranked]
+
+
+def rank_documents(results: Dict[str, List[Dict[str, Any]]], query: str) -> List[RankedResult]:
+    """Rank documents that were matched elsewhere, e.g. by the Mongo search."""
+    return SearchIndex(results).rank(query, match_all=False)
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    if not cursor.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(cursor)
+
+
+def paginate(
+    ranked: List[RankedResult],
+    limit: int = DEFAULT_SEARCH_LIMIT,
+    offset: int = 0,
+    per_type_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Cut one page out of ranked results, grouped in the /api/search shape."""
+    if per_type_limit:
+        kept: Dict[str, int] = {}
+        capped = []
+        for result in ranked:
+            if kept.get(result[1], 0) < per_type_limit:
+                kept[result[1]] = kept.get(result[1], 0) + 1
+                capped.append(result)
+        ranked = capped
+
+    page = ranked[offset:offset + limit]
+    grouped: Dict[str, List[Dict[str, Any]]] = {collection: [] for collection in SEARCH_FIELDS}
+    for _, collection, document in page:
+        grouped[collection].append(document)
+
+    next_offset = offset + limit
+    return {
+        **grouped,
+        "results": [
+            {
+                "type": collection,
+                "id": document.get("id"),
+                "name": display_name(document),
+                "score": round(score, 2),
+            }
+            for score, collection, document in page
+        ],
+        "total_results": len(ranked),
+        "next_cursor": str(next_offset) if next_offset < len(ranked) else None,
+    }
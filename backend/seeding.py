@@ -0,0 +1,151 @@
+"""Idempotent, versioned seeding of the static catalog collections.
+
+The seed content is hashed and the hash is stored in the metadata
+collection. Startup only rewrites the catalog when the hash changed, and a
+short-lived lock document keeps several workers booting at once from
+reseeding the same collections concurrently. User data (ratings, custom
+builds) is never touched.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+import database
+from database import METADATA
+from indexes import create_indexes
+
+logger = logging.getLogger(__name__)
+
+# "versioned" reseeds only when the seed hash changes, "force" always
+# reseeds, "off" leaves the database alone.
+SEED_MODE = os.getenv("SEED_MODE", "versioned")
+SEED_LOCK_TIMEOUT_SECONDS = int(os.getenv("SEED_LOCK_TIMEOUT_SECONDS", "60"))
+SEED_WAIT_INTERVAL_SECONDS = 0.2
+
+# Fixed namespace so seed ids survive restarts and deploys
+SEED_ID_NAMESPACE = uuid.UUID("e4041980-e125-4955-938d-bae4df7727de")
+
+# Field naming each seed entity; walkthroughs are keyed by character
+SEED_NAME_FIELDS = {database.WALKTHROUGHS: "character"}
+
+SEED_STATE_ID = "seed_state"
+SEED_LOCK_ID = "seed_lock"
+
+
+def seed_id(collection: str, name: str) -> str:
+    return str(uuid.uuid5(SEED_ID_NAMESPACE, f"{collection}:{name}"))
+
+
+def assign_seed_ids(seed: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Give every seed document an id derived from its type and name."""
+    return {
+        collection: [
+            {"id": seed_id(collection, document[SEED_NAME_FIELDS.get(collection, "name")]), **document}
+            for document in documents
+        ]
+        for collection, documents in seed.items()
+    }
+
+
+def seed_content_hash(seed: Dict[str, List[Dict[str, Any]]]) -> str:
+    encoded = json.dumps(seed, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+async def get_seed_version() -> Optional[str]:
+    state = await database.find_one(METADATA, {"_id": SEED_STATE_ID})
+    return state["hash"] if state else None
+
+
+async def acquire_lock(lock_id: str, owner: str) -> bool:
+    """Take the metadata lock ``lock_id`` unless another owner holds it
+    and it has not expired."""
+    now = datetime.utcnow()
+    try:
+        await database.update_one(
+            METADATA,
+            {"_id": lock_id, "expires_at": {"$lt": now}},
+            {"$set": {
+                "owner": owner,
+                "expires_at": now + timedelta(seconds=SEED_LOCK_TIMEOUT_SECONDS),
+            }},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lock
+        return False
+    return True
+
+
+async def release_lock(lock_id: str, owner: str) -> None:
+    await database.delete_one(METADATA, {"_id": lock_id, "owner": owner})
+
+
+async def wait_for_release(lock_id: str) -> None:
+    deadline = datetime.utcnow() + timedelta(seconds=SEED_LOCK_TIMEOUT_SECONDS)
+    while datetime.utcnow() < deadline:
+        if await database.find_one(METADATA, {"_id": lock_id, "expires_at": {"$gte": datetime.utcnow()}}) is None:
+            return
+        await asyncio.sleep(SEED_WAIT_INTERVAL_SECONDS)
+    logger.warning("Timed out waiting for another worker to release %s", lock_id)
+
+
+async def _wait_for_version(seed_hash: str) -> None:
+    deadline = datetime.utcnow() + timedelta(seconds=SEED_LOCK_TIMEOUT_SECONDS)
+    while datetime.utcnow() < deadline:
+        if await get_seed_version() == seed_hash:
+            return
+        await asyncio.sleep(SEED_WAIT_INTERVAL_SECONDS)
+    logger.warning("Timed out waiting for another worker to finish seeding")
+
+
+async def _write_seed(seed: Dict[str, List[Dict[str, Any]]], seed_hash: str) -> None:
+    for collection, documents in seed.items():
+        # insert_many adds _id to the documents it is given
+        await database.replace_collection(
+            collection,
+            [dict(document) for document in documents],
+            prepare=functools.partial(create_indexes, collection),
+        )
+    await database.update_one(
+        METADATA,
+        {"_id": SEED_STATE_ID},
+        {"$set": {"hash": seed_hash, "seeded_at": datetime.utcnow()}},
+        upsert=True,
+    )
+
+
+async def ensure_seed_data(seed: Dict[str, List[Dict[str, Any]]]) -> bool:
+    """Bring the catalog collections in line with ``seed``.
+
+    Returns True when this call rewrote the collections.
+    """
+    if SEED_MODE == "off":
+        return False
+
+    seed_hash = seed_content_hash(seed)
+    if SEED_MODE != "force" and await get_seed_version() == seed_hash:
+        return False
+
+    owner = uuid.uuid4().hex
+    if not await acquire_lock(SEED_LOCK_ID, owner):
+        await _wait_for_version(seed_hash)
+        return False
+
+    try:
+        # Another worker may have finished while we were acquiring the lock
+        if SEED_MODE != "force" and await get_seed_version() == seed_hash:
+            return False
+        logger.info("Seeding catalog collections (version %s)", seed_hash[:12])
+        await _write_seed(seed, seed_hash)
+        return True
+    finally:
+        await release_lock(SEED_LOCK_ID, owner)
@@ -1,12 +1,61 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
+from fastapi.responses import JSONResponse
+from pymongo.errors import ExecutionTimeout
 from typing import List, Dict, Optional
-import os
-import uuid
-from datetime import datetime
+import asyncio
 import re
 
+import database
+from database import (
+    BOSSES,
+    CHARACTERS,
+    BUILDS,
+    ACHIEVEMENTS,
+    WALKTHROUGHS,
+    CUSTOM_BUILDS,
+    CREATURES,
+    SECRETS,
+    WEAPON_SKILLS,
+    WEAPON_PASSIVES,
+)
+from autocomplete import DEFAULT_AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT
+from catalog import get_catalog, reload_catalog
+from custom_builds import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    backfill_submissions,
+    get_custom_build,
+    list_custom_builds,
+    store_custom_build,
+)
+from indexes import ENSURE_INDEXES, ensure_indexes, report_missing_indexes
+from models import CustomBuildCreate
+from rating_buffer import RATING_WRITE_BEHIND, rating_buffer
+from ratings import (
+    average_rating,
+    ensure_rating_stats,
+    get_all_rating_stats,
+    get_rating_stats,
+    rating_summary,
+    record_rating,
+)
+from responses import body_response
+from search_index import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_QUERY_LENGTH,
+    MAX_SEARCH_LIMIT,
+    QUERY_MAX_TIME_MS,
+    SEARCH_BACKEND,
+    SEARCH_FIELDS,
+    decode_cursor,
+    paginate,
+    rank_documents,
+)
+from seeding import assign_seed_ids, ensure_seed_data
+from similarity import DEFAULT_SIMILAR_LIMIT, MAX_SIMILAR_LIMIT, get_similarity_index
+from team_optimizer import DEFAULT_TEAM_LIMIT, MAX_TEAM_LIMIT
+
 app = FastAPI(title="Elden Ring Nightreign Boss Guide API")
 
 # CORS configuration
@@ -18,32 +67,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database connection
-MONGO_URL = os.environ.get('MONGO_URL')
-client = MongoClient(MONGO_URL)
-DB_NAME = os.getenv("DB_NAME", "nightreign_guide")
-db = client[DB_NAME] 
-# db = client.nightreign_guide
-
-# Collections
-bosses_collection = db.bosses
-characters_collection = db.characters
-builds_collection = db.builds
-achievements_collection = db.achievements
-walkthroughs_collection = db.walkthroughs
-user_ratings_collection = db.user_ratings
-custom_builds_collection = db.custom_builds
-creatures_collection = db.creatures
-secrets_collection = db.secrets
-weapon_skills_collection = db.weapon_skills
-weapon_passives_collection = db.weapon_passives
-
 # Sample data initialization
-def initialize_data():
+def build_seed_data():
     # Initialize all 8 Nightlords with corrected level ranges (max 15)
     bosses = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Gladius, Beast of Night",
             "expedition_name": "Tricephalos",
             "description": "The initial Nightlord that players encounter. A monstrous three-headed wolf resembling a cerberus.",
@@ -63,7 +91,6 @@ def initialize_data():
             "recommended_builds": ["Wylder Versatile", "Guardian Tank", "Ironeye Marksman"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Maris, Fathom of Night",
             "expedition_name": "Augur",
             "description": "An enigmatic aquatic creature that fills the battlefield with explosive jellyfish and hostile hydras.",
@@ -83,7 +110,6 @@ def initialize_data():
             "recommended_builds": ["Ironeye Marksman", "Recluse Spellcaster", "Duchess Shadow"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Gnoster, Wisdom of Night",
             "expedition_name": "Sentient Pest",
             "description": "Two gigantic insects acting as one entity - a massive moth and a colossal arachnid.",
@@ -103,7 +129,6 @@ def initialize_data():
             "recommended_builds": ["Recluse Spellcaster", "Executor Duelist", "Wylder Versatile"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Adel, Baron of Night",
             "expedition_name": "Gaping Jaw",
             "description": "A colossal draconic entity with a grotesquely twisted mouth that can seize and chew players.",
@@ -123,7 +148,6 @@ def initialize_data():
             "recommended_builds": ["Duchess Shadow", "Executor Duelist", "Guardian Tank"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Caligo, Miasma of Night",
             "expedition_name": "Fissure in the Fog",
             "description": "A fog-based Nightlord that creates confusion and uses fire attacks.",
@@ -143,7 +167,6 @@ def initialize_data():
             "recommended_builds": ["Recluse Spellcaster", "Raider Berserker", "Revenant Support"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Libra, Creature of Night",
             "expedition_name": "Equilibrious Beast",
             "description": "A demon with goat-like head that offers deals before combat and uses alchemy to produce false gold.",
@@ -163,7 +186,6 @@ def initialize_data():
             "recommended_builds": ["Recluse Spellcaster", "Revenant Support", "Wylder Versatile"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Fulghor, Champion of Nightglow",
             "expedition_name": "Darkdrift Knight",
             "description": "One of the most challenging Nightlords with rapid movements and powerful attacks.",
@@ -183,7 +205,6 @@ def initialize_data():
             "recommended_builds": ["Guardian Tank", "Ironeye Marksman", "Executor Duelist"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Heolstor, the Nightlord",
             "expedition_name": "Night Aspect",
             "description": "The final boss with a two-phase battle. The ultimate challenge in Nightreign.",
@@ -207,7 +228,6 @@ def initialize_data():
     # Initialize characters with corrected max level (15)
     characters = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Wylder",
             "description": "A versatile knight with balanced stats and a grappling hook for agility.",
             "primary_stat": "Balanced",
@@ -220,7 +240,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Raider",
             "description": "A strength-focused bruiser excelling in melee combat with colossal weapons.",
             "primary_stat": "Strength",
@@ -233,7 +252,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Executor",
             "description": "A high-risk, high-reward character adept with katanas and deflection.",
             "primary_stat": "Dexterity",
@@ -246,7 +264,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Recluse",
             "description": "A spellcaster with HP draining abilities and elemental attacks.",
             "primary_stat": "Intelligence",
@@ -259,7 +276,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Guardian",
             "description": "A tank class specializing in absorbing damage and protecting teammates.",
             "primary_stat": "Strength",
@@ -272,7 +288,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Duchess",
             "description": "A rogue-type character excelling in speed and agility with damage amplification.",
             "primary_stat": "Dexterity",
@@ -285,7 +300,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Ironeye",
             "description": "A long-ranged archer with tactical marking abilities.",
             "primary_stat": "Dexterity",
@@ -298,7 +312,6 @@ def initialize_data():
             "max_level": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Revenant",
             "description": "A support character capable of summoning allies and providing invincibility.",
             "primary_stat": "Faith",
@@ -316,7 +329,6 @@ def initialize_data():
     builds = [
         # Wylder builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Wylder Versatile",
             "character": "Wylder",
             "type": "Hybrid",
@@ -330,7 +342,6 @@ def initialize_data():
             "best_for": ["Wylder"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Wylder Hybrid",
             "character": "Wylder",
             "type": "Adaptive",
@@ -345,7 +356,6 @@ def initialize_data():
         },
         # Raider builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Raider Berserker",
             "character": "Raider",
             "type": "Strength",
@@ -359,7 +369,6 @@ def initialize_data():
             "best_for": ["Raider"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Raider Tank",
             "character": "Raider",
             "type": "Defensive",
@@ -374,7 +383,6 @@ def initialize_data():
         },
         # Executor builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Executor Duelist",
             "character": "Executor",
             "type": "Dexterity",
@@ -388,7 +396,6 @@ def initialize_data():
             "best_for": ["Executor"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Executor Beast",
             "character": "Executor",
             "type": "Transformation",
@@ -403,7 +410,6 @@ def initialize_data():
         },
         # Recluse builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Recluse Spellcaster",
             "character": "Recluse",
             "type": "Intelligence",
@@ -417,7 +423,6 @@ def initialize_data():
             "best_for": ["Recluse"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Recluse Drain",
             "character": "Recluse",
             "type": "Sustain",
@@ -432,7 +437,6 @@ def initialize_data():
         },
         # Guardian builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Guardian Tank",
             "character": "Guardian",
             "type": "Defensive",
@@ -446,7 +450,6 @@ def initialize_data():
             "best_for": ["Guardian"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Guardian Support",
             "character": "Guardian",
             "type": "Support",
@@ -461,7 +464,6 @@ def initialize_data():
         },
         # Duchess builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Duchess Shadow",
             "character": "Duchess",
             "type": "Stealth",
@@ -475,7 +477,6 @@ def initialize_data():
             "best_for": ["Duchess"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Duchess Support",
             "character": "Duchess",
             "type": "Support",
@@ -490,7 +491,6 @@ def initialize_data():
         },
         # Ironeye builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Ironeye Marksman",
             "character": "Ironeye",
             "type": "Ranged",
@@ -504,7 +504,6 @@ def initialize_data():
             "best_for": ["Ironeye"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Ironeye Support",
             "character": "Ironeye",
             "type": "Support",
@@ -519,7 +518,6 @@ def initialize_data():
         },
         # Revenant builds
         {
-            "id": str(uuid.uuid4()),
             "name": "Revenant Support",
             "character": "Revenant",
             "type": "Support",
@@ -533,7 +531,6 @@ def initialize_data():
             "best_for": ["Revenant"]
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Revenant Summoner",
             "character": "Revenant",
             "type": "Summon",
@@ -552,7 +549,6 @@ def initialize_data():
     achievements = [
         # Platinum/Master Achievement
         {
-            "id": str(uuid.uuid4()),
             "name": "Nightreign",
             "description": "Unlock all achievements",
             "category": "Platinum",
@@ -564,7 +560,6 @@ def initialize_data():
         },
         # Story Progression Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "The Shrouded Roundtable Hold",
             "description": "Reach the Shrouded Roundtable Hold",
             "category": "Progress",
@@ -575,7 +570,6 @@ def initialize_data():
             "rank": 37
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Night Begins",
             "description": "The Night Aspect appears",
             "category": "Story",
@@ -586,7 +580,6 @@ def initialize_data():
             "rank": 10
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Dawn",
             "description": "Reach the ending",
             "category": "Completion",
@@ -598,7 +591,6 @@ def initialize_data():
         },
         # Equipment and Power Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "Relic",
             "description": "Invoke the power of a relic for the first time",
             "category": "Equipment",
@@ -609,7 +601,6 @@ def initialize_data():
             "rank": 35
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Dresser",
             "description": "Change garb via the dresser for the first time",
             "category": "Customization",
@@ -620,7 +611,6 @@ def initialize_data():
             "rank": 34
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Vessel",
             "description": "Acquire a new vessel and conduct a different relic rite for the first time",
             "category": "Equipment",
@@ -631,7 +621,6 @@ def initialize_data():
             "rank": 33
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Replenished Sacred Flasks",
             "description": "Acquire a great number of flask charges",
             "category": "Progression",
@@ -642,7 +631,6 @@ def initialize_data():
             "rank": 25
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Legendary Armament",
             "description": "Acquire a legendary armament for the first time",
             "category": "Equipment",
@@ -653,7 +641,6 @@ def initialize_data():
             "rank": 24
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Obtained Vessels",
             "description": "Acquire a great many vessels",
             "category": "Collection",
@@ -664,7 +651,6 @@ def initialize_data():
             "rank": 23
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Mastery",
             "description": "Attain maximum level",
             "category": "Character",
@@ -675,7 +661,6 @@ def initialize_data():
             "rank": 14
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Set and Steadfast",
             "description": "Acquire many pieces of high-rarity equipment on a single expedition",
             "category": "Equipment",
@@ -687,7 +672,6 @@ def initialize_data():
         },
         # Character Unlock Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "The Duchess Joins the Fray",
             "description": "Unlock The Duchess as a playable character",
             "category": "Character",
@@ -698,7 +682,6 @@ def initialize_data():
             "rank": 30
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "The Revenant Joins the Fray",
             "description": "Unlock The Revenant as a playable character",
             "category": "Character",
@@ -710,7 +693,6 @@ def initialize_data():
         },
         # Boss Defeat Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "Tricephalos",
             "description": "Defeat Gladius, Beast of Night",
             "category": "Boss",
@@ -721,7 +703,6 @@ def initialize_data():
             "rank": 32
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Augur",
             "description": "Defeat Maris, Fathom of Night",
             "category": "Boss",
@@ -732,7 +713,6 @@ def initialize_data():
             "rank": 29
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Sentient Pest",
             "description": "Defeat Gnoster, Wisdom of Night",
             "category": "Boss",
@@ -743,7 +723,6 @@ def initialize_data():
             "rank": 27
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Gaping Jaw",
             "description": "Defeat Adel, Baron of Night",
             "category": "Boss",
@@ -754,7 +733,6 @@ def initialize_data():
             "rank": 22
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Fissure in the Fog",
             "description": "Defeat Caligo, Miasma of Night",
             "category": "Boss",
@@ -765,7 +743,6 @@ def initialize_data():
             "rank": 19
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Equilibrious Beast",
             "description": "Defeat Libra, Creature of Night",
             "category": "Boss",
@@ -776,7 +753,6 @@ def initialize_data():
             "rank": 17
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Darkdrift Knight",
             "description": "Defeat Fulghor, Champion of Nightglow",
             "category": "Boss",
@@ -787,7 +763,6 @@ def initialize_data():
             "rank": 11
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Night Aspect",
             "description": "Defeat Heolstor, the Nightlord",
             "category": "Boss",
@@ -798,7 +773,6 @@ def initialize_data():
             "rank": 6
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Nightlord Conqueror",
             "description": "Defeat all Nightlords",
             "category": "Combat",
@@ -810,7 +784,6 @@ def initialize_data():
         },
         # Combat Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "Untold Power",
             "description": "Defeat 10 or more great enemies on one expedition",
             "category": "Combat",
@@ -821,7 +794,6 @@ def initialize_data():
             "rank": 26
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Nightlord Slayer",
             "description": "Defeat three different Nightlords in a row",
             "category": "Combat",
@@ -833,7 +805,6 @@ def initialize_data():
         },
         # Exploration Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "Mountaintop",
             "description": "Find the secret of the Mountaintop",
             "category": "Exploration",
@@ -844,7 +815,6 @@ def initialize_data():
             "rank": 21
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "The Crater",
             "description": "Find the secret of the Crater",
             "category": "Exploration",
@@ -855,7 +825,6 @@ def initialize_data():
             "rank": 20
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Rotted Woods",
             "description": "Find the secret of the Rotted Woods",
             "category": "Exploration",
@@ -866,7 +835,6 @@ def initialize_data():
             "rank": 18
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Noklateo, the Shrouded City",
             "description": "Find the secret of Noklateo, the Shrouded City",
             "category": "Exploration",
@@ -877,7 +845,6 @@ def initialize_data():
             "rank": 16
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Shifting Earth",
             "description": "Find the secrets of all Shifting Earth locations",
             "category": "Exploration",
@@ -889,7 +856,6 @@ def initialize_data():
         },
         # Raid Achievements
         {
-            "id": str(uuid.uuid4()),
             "name": "Fell Omen",
             "description": "Complete the Fell Omen raid",
             "category": "Raid",
@@ -900,7 +866,6 @@ def initialize_data():
             "rank": 8
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Plague of Locusts",
             "description": "Complete the Sentient Pest raid",
             "category": "Raid",
@@ -911,7 +876,6 @@ def initialize_data():
             "rank": 15
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Typhoon",
             "description": "Complete the Augur raid",
             "category": "Raid",
@@ -922,7 +886,6 @@ def initialize_data():
             "rank": 31
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "True Arbiter",
             "description": "Complete the Equilibrious Beast raid",
             "category": "Raid",
@@ -933,7 +896,6 @@ def initialize_data():
             "rank": 5
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Old Gaol",
             "description": "Complete the oldest gaol",
             "category": "Raid",
@@ -945,7 +907,6 @@ def initialize_data():
         },
         # Challenge Achievement
         {
-            "id": str(uuid.uuid4()),
             "name": "A Champion's Path",
             "description": "Defeat the Nightlord using all characters",
             "category": "Challenge",
@@ -957,7 +918,6 @@ def initialize_data():
         },
         # Additional Equipment Achievement
         {
-            "id": str(uuid.uuid4()),
             "name": "Master of Arms",
             "description": "Acquire all weapon types",
             "category": "Equipment",
@@ -972,7 +932,6 @@ def initialize_data():
     # Initialize all character walkthroughs (8 total)
     walkthroughs = [
         {
-            "id": str(uuid.uuid4()),
             "character": "Wylder",
             "title": "Wylder's Remembrance Quest",
             "description": "Complete walkthrough for Wylder's remembrance questline",
@@ -1018,7 +977,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Guardian",
             "title": "Guardian's Remembrance Quest",
             "description": "Complete walkthrough for Guardian's remembrance questline",
@@ -1075,7 +1033,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Ironeye",
             "title": "Ironeye's Remembrance Quest",
             "description": "Complete walkthrough for Ironeye's remembrance questline",
@@ -1119,7 +1076,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Duchess",
             "title": "Duchess's Remembrance Quest",
             "description": "Complete walkthrough for Duchess's remembrance questline",
@@ -1175,7 +1131,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Raider",
             "title": "Raider's Remembrance Quest",
             "description": "Complete walkthrough for Raider's remembrance questline",
@@ -1214,7 +1169,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Revenant",
             "title": "Revenant's Remembrance Quest",
             "description": "Complete walkthrough for Revenant's remembrance questline",
@@ -1253,7 +1207,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Recluse",
             "title": "Recluse's Remembrance Quest",
             "description": "Complete walkthrough for Recluse's remembrance questline",
@@ -1290,7 +1243,6 @@ def initialize_data():
             ]
         },
         {
-            "id": str(uuid.uuid4()),
             "character": "Executor",
             "title": "Executor's Remembrance Quest",
             "description": "Complete walkthrough for Executor's remembrance questline",
@@ -1324,7 +1276,6 @@ def initialize_data():
     # Initialize creatures and enemies database
     creatures = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Gladius, Beast of Night",
             "type": "Nightlord",
             "description": "A monstrous three-headed wolf resembling a cerberus, capable of splitting into three individual beasts",
@@ -1336,7 +1287,6 @@ def initialize_data():
             "notes": "Can split into three beasts and reunite at will. Wields chain-bound sword as projectile."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Maris, Fathom of Night",
             "type": "Nightlord",
             "description": "An enigmatic aquatic creature resembling a cnidarian with jellyfish and hydra summons",
@@ -1348,7 +1298,6 @@ def initialize_data():
             "notes": "Fills battlefield with explosive jellyfish and hostile hydras. Inflicts Sleep status."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Gnoster, Wisdom of Night",
             "type": "Nightlord",
             "description": "Two gigantic insects acting as one entity - a massive moth and colossal arachnid",
@@ -1360,7 +1309,6 @@ def initialize_data():
             "notes": "Moth unleashes magical attacks and poisonous clouds. Arachnid has subterranean mobility."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Adel, Baron of Night",
             "type": "Nightlord",
             "description": "A colossal draconic entity with a grotesquely twisted mouth",
@@ -1372,7 +1320,6 @@ def initialize_data():
             "notes": "Can seize and chew players. Causes seismic shocks and lightning explosions. Purges poison by vomiting."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Caligo, Miasma of Night",
             "type": "Nightlord",
             "description": "A fog-based Nightlord that creates battlefield confusion",
@@ -1384,7 +1331,6 @@ def initialize_data():
             "notes": "Creates dense fog to separate and confuse players."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Libra, Creature of Night",
             "type": "Nightlord",
             "description": "A demon with goat-like head and multiple eyes, reminiscent of Baphomet",
@@ -1396,7 +1342,6 @@ def initialize_data():
             "notes": "Offers deals before combat. Uses alchemy to produce false gold inducing Madness."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Fulghor, Champion of Nightglow",
             "type": "Nightlord",
             "description": "Swift and deadly Nightlord with rapid attack patterns",
@@ -1408,7 +1353,6 @@ def initialize_data():
             "notes": "Most challenging Nightlord with unpredictable movements and powerful attacks."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Heolstor, the Nightlord",
             "type": "Nightlord",
             "description": "The final boss with mastery over all night aspects",
@@ -1420,7 +1364,6 @@ def initialize_data():
             "notes": "Two-phase battle. Ultimate challenge requiring mastery of all game mechanics."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Dancer of the Boreal Valley",
             "type": "Elite Enemy",
             "description": "Swift and deadly warrior with unpredictable attack patterns",
@@ -1432,7 +1375,6 @@ def initialize_data():
             "notes": "Returning enemy from Dark Souls 3 with enhanced mobility."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Gaping Dragon",
             "type": "Elite Enemy",
             "description": "Grotesque, massive creature with acid-based attacks",
@@ -1444,7 +1386,6 @@ def initialize_data():
             "notes": "Coats battlefield in acid, instantly eliminating Spirit Summons."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Centipede Demon",
             "type": "Elite Enemy",
             "description": "Segmented insectoid creature with multiple attack phases",
@@ -1456,7 +1397,6 @@ def initialize_data():
             "notes": "Redesigned for Nightreign's faster-paced combat."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Draconic Tree Sentinel",
             "type": "Elite Enemy",
             "description": "Heavily armored dragon rider with fire-based abilities",
@@ -1468,7 +1408,6 @@ def initialize_data():
             "notes": "Mounted combat specialist with powerful area attacks."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Morgott, the Fell Omen",
             "type": "Elite Enemy",
             "description": "Cursed omen with golden weapon manifestations",
@@ -1480,7 +1419,6 @@ def initialize_data():
             "notes": "First major boss of Elden Ring returns as roaming enemy."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Duke's Dear Freja",
             "type": "Elite Enemy",
             "description": "Giant two-headed spider surrounded by smaller arachnids",
@@ -1492,7 +1430,6 @@ def initialize_data():
             "notes": "Controls swarms of smaller spiders. Vulnerable when both heads are targeted."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Golden Hippopotamus",
             "type": "Large Enemy",
             "description": "Massive golden beast with powerful bite and charging attacks",
@@ -1504,7 +1441,6 @@ def initialize_data():
             "notes": "Charges with mouth wide open, slamming everything in its path."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Night-Swallowed Golden Hippopotamus",
             "type": "Large Enemy",
             "description": "Corrupted version of Golden Hippopotamus with dark powers",
@@ -1516,7 +1452,6 @@ def initialize_data():
             "notes": "Required for Recluse's remembrance quest. Enhanced with dark abilities."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Royal Cavalryman",
             "type": "Medium Enemy",
             "description": "Elite mounted warrior with spear and shield",
@@ -1528,7 +1463,6 @@ def initialize_data():
             "notes": "Often encountered in pairs or trios. Highly mobile mounted combat."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Onestrike Gladiator",
             "type": "Medium Enemy",
             "description": "Arena fighter specializing in devastating single attacks",
@@ -1540,7 +1474,6 @@ def initialize_data():
             "notes": "Required for Raider's remembrance quest. Focuses on powerful single strikes."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Blinding Elder Lion",
             "type": "Medium Enemy",
             "description": "Ancient lion with blinding light attacks",
@@ -1552,7 +1485,6 @@ def initialize_data():
             "notes": "Required for Raider's remembrance quest. Uses blinding attacks to disorient."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "White Horn",
             "type": "Medium Enemy",
             "description": "Horned beast with charging and goring attacks",
@@ -1564,7 +1496,6 @@ def initialize_data():
             "notes": "Required for Raider's remembrance quest. Powerful charging attacks."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Night Huntsman",
             "type": "Medium Enemy",
             "description": "Stealthy hunter with bow and tracking abilities",
@@ -1576,7 +1507,6 @@ def initialize_data():
             "notes": "Required for Ironeye's remembrance quest. Carries the Traitor's Letter."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Stray Bloodhound Knight",
             "type": "Medium Enemy",
             "description": "Wandering knight with bloodhound companion",
@@ -1588,7 +1518,6 @@ def initialize_data():
             "notes": "Required for Executor's remembrance quest. Guards the Blessed Flowers."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Erdtree Avatar",
             "type": "Large Enemy",
             "description": "Guardian of the Erdtree with nature-based attacks",
@@ -1600,7 +1529,6 @@ def initialize_data():
             "notes": "Required for Executor's remembrance quest. Guards the Golden Sprout."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Cracked Golem",
             "type": "Large Enemy",
             "description": "Ancient stone construct with structural weaknesses",
@@ -1612,7 +1540,6 @@ def initialize_data():
             "notes": "Required for Guardian's remembrance quest. Target weak points for efficiency."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Mimic Troll",
             "type": "Large Enemy",
             "description": "Shape-shifting troll that mimics player abilities",
@@ -1624,7 +1551,6 @@ def initialize_data():
             "notes": "Required for Wylder's remembrance quest. Adapts to player tactics."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Corrosion",
             "type": "Elite Enemy",
             "description": "Acidic entity that corrodes equipment and environment",
@@ -1636,7 +1562,6 @@ def initialize_data():
             "notes": "Required for Revenant's remembrance quest. Degrades equipment over time."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Contaminant",
             "type": "Elite Enemy",
             "description": "Toxic creature that spreads contamination",
@@ -1648,7 +1573,6 @@ def initialize_data():
             "notes": "Required for Revenant's remembrance quest. Use summons Frederick, Sebastian, and Helen."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Executor's Cry",
             "type": "Special Enemy",
             "description": "Manifestation of Executor's inner torment",
@@ -1660,7 +1584,6 @@ def initialize_data():
             "notes": "Required for Executor's remembrance quest. Psychological battle more than physical."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Fallen Mercenaries",
             "type": "Small Enemy",
             "description": "Groups of corrupted mercenaries",
@@ -1672,7 +1595,6 @@ def initialize_data():
             "notes": "Required for Duchess's remembrance quest. Guard Weathervane's Words."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Spectral Merchant",
             "type": "Special Enemy",
             "description": "Ghostly merchant found in Roundtable Hold",
@@ -1684,7 +1606,6 @@ def initialize_data():
             "notes": "Required for Guardian's remembrance quest. Must be defeated after cutscene."
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Scale-Bearing Merchant",
             "type": "NPC Enemy",
             "description": "Merchant selling valuable tomes for high prices",
@@ -1700,7 +1621,6 @@ def initialize_data():
     # Initialize secrets
     secrets = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Duchess Character Unlock",
             "category": "Character Unlock",
             "description": "Unlock the Duchess character by completing the Tricephalos expedition and obtaining the Old Pocketwatch from Gladius.",
@@ -1710,7 +1630,6 @@ def initialize_data():
             "difficulty": "Medium"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Revenant Character Unlock",
             "category": "Character Unlock", 
             "description": "Unlock the Revenant character after unlocking the Duchess. Purchase the Besmirched Frame at the Small Jar Bazaar and defeat the Revenant boss.",
@@ -1720,7 +1639,6 @@ def initialize_data():
             "difficulty": "Hard"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "The Crater",
             "category": "Location Secret",
             "description": "A giant crater appears in the northern section of the map, allowing players to upgrade weapons to Legendary.",
@@ -1730,7 +1648,6 @@ def initialize_data():
             "difficulty": "Hard"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Mountaintop",
             "category": "Location Secret",
             "description": "A snowy terrain that grants the Favor of the Mountaintop buff, reducing frostbite damage and boosting attack.",
@@ -1740,7 +1657,6 @@ def initialize_data():
             "difficulty": "Medium"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Rotted Woods",
             "category": "Location Secret",
             "description": "A land ravaged by Scarlet Rot that provides the Favor of the Forest buff, nullifying scarlet rot effects and increasing max HP.",
@@ -1750,7 +1666,6 @@ def initialize_data():
             "difficulty": "Medium"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Noklateo",
             "category": "Location Secret",
             "description": "A large structure with massive walls that holds the Favor of Noklateo, allowing players to rise from near-death once.",
@@ -1764,7 +1679,6 @@ def initialize_data():
     # Initialize weapon skills
     weapon_skills = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Alabaster Lord's Pull",
             "fp_cost": 15,
             "description": "Thrust the armament into the ground to create a gravity well, dealing damage and pulling enemies in.",
@@ -1774,7 +1688,6 @@ def initialize_data():
             "damage_type": "Physical + Gravity"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Ancient Lightning Spear",
             "fp_cost": 24,
             "description": "Imbue the armament with the ancient dragons' red lightning, then throw it as a spear.",
@@ -1784,7 +1697,6 @@ def initialize_data():
             "damage_type": "Lightning"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Angel's Wings",
             "fp_cost": 17,
             "description": "Jump and imbue the wing-blade of the armament with light, then deliver a slashing attack.",
@@ -1794,7 +1706,6 @@ def initialize_data():
             "damage_type": "Physical + Holy"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Assassin's Gambit",
             "fp_cost": 5,
             "description": "Skill that masks the user's presence at the cost of a self-inflicted wound.",
@@ -1804,7 +1715,6 @@ def initialize_data():
             "damage_type": "Self-inflicted"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Barbaric Roar",
             "fp_cost": 16,
             "description": "Let loose a bestial roar to rally the spirit and increase attack power.",
@@ -1814,7 +1724,6 @@ def initialize_data():
             "damage_type": "Physical Enhancement"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Bloodblade Dance",
             "fp_cost": 20,
             "description": "Leap forward and perform a series of spinning blade attacks that build up blood loss.",
@@ -1824,7 +1733,6 @@ def initialize_data():
             "damage_type": "Physical + Bleed"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Carian Grandeur",
             "fp_cost": 26,
             "description": "Imbue the armament with glintstone magic to unleash a powerful magical shockwave.",
@@ -1834,7 +1742,6 @@ def initialize_data():
             "damage_type": "Magic"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Flame of the Redmanes",
             "fp_cost": 20,
             "description": "Skill of the Redmane Knights. Create a surge of flames that deals fire damage.",
@@ -1844,7 +1751,6 @@ def initialize_data():
             "damage_type": "Fire"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Hoarfrost Stomp",
             "fp_cost": 10,
             "description": "Stomp hard to create a trail of freezing mist that deals magic damage.",
@@ -1854,7 +1760,6 @@ def initialize_data():
             "damage_type": "Magic + Frostbite"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Lightning Ram",
             "fp_cost": 18,
             "description": "Surround the armament with lightning and charge forward with tremendous force.",
@@ -1868,7 +1773,6 @@ def initialize_data():
     # Initialize weapon passive abilities
     weapon_passives = [
         {
-            "id": str(uuid.uuid4()),
             "name": "Add Holy to Weapon",
             "category": "Damage Enhancement",
             "description": "Infuses attacks with additional Holy damage.",
@@ -1878,7 +1782,6 @@ def initialize_data():
             "scaling": "Faith"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Add Magic to Weapon",
             "category": "Damage Enhancement", 
             "description": "Infuses attacks with additional Magic damage.",
@@ -1888,7 +1791,6 @@ def initialize_data():
             "scaling": "Intelligence"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Attack Up when Wielding Two Armaments",
             "category": "Damage Enhancement",
             "description": "Boosts attack power when dual-wielding weapons.",
@@ -1898,7 +1800,6 @@ def initialize_data():
             "scaling": "Dexterity/Strength"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Improved Attack Power at Full HP",
             "category": "Conditional Damage",
             "description": "Increases attack power when health is full.",
@@ -1908,7 +1809,6 @@ def initialize_data():
             "scaling": "Health dependent"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Improved Attack Power at Low HP",
             "category": "Conditional Damage",
             "description": "Increases attack power when health is low.",
@@ -1918,7 +1818,6 @@ def initialize_data():
             "scaling": "Health dependent"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Attacks Inflict Poison",
             "category": "Status Infliction",
             "description": "Adds poison buildup to attacks.",
@@ -1928,7 +1827,6 @@ def initialize_data():
             "scaling": "Arcane"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Attacks Inflict Sleep",
             "category": "Status Infliction",
             "description": "Adds sleep buildup to attacks.",
@@ -1938,7 +1836,6 @@ def initialize_data():
             "scaling": "Intelligence/Arcane"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Continuous HP Recovery",
             "category": "Health Management",
             "description": "Gradually restores health over time.",
@@ -1948,7 +1845,6 @@ def initialize_data():
             "scaling": "Faith"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Defeating Enemies Restores HP",
             "category": "Health Management",
             "description": "Restores health upon defeating enemies.",
@@ -1958,7 +1854,6 @@ def initialize_data():
             "scaling": "Kill dependent"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "HP Restoration Upon Attacks",
             "category": "Health Management",
             "description": "Restores health with each successful attack.",
@@ -1968,7 +1863,6 @@ def initialize_data():
             "scaling": "Hit frequency"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "FP Restoration Upon Attacks",
             "category": "Resource Management",
             "description": "Restores Focus Points with each successful attack.",
@@ -1978,7 +1872,6 @@ def initialize_data():
             "scaling": "Hit frequency"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Critical Hit HP Restoration",
             "category": "Critical Effects",
             "description": "Restores health upon landing critical hits.",
@@ -1988,7 +1881,6 @@ def initialize_data():
             "scaling": "Critical hit rate"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Critical Hit FP Restoration",
             "category": "Critical Effects",
             "description": "Restores FP upon landing critical hits.",
@@ -1998,7 +1890,6 @@ def initialize_data():
             "scaling": "Critical hit rate"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Dmg Negation Up While Casting Spells",
             "category": "Defensive Enhancement",
             "description": "Reduces damage taken while casting spells.",
@@ -2008,7 +1899,6 @@ def initialize_data():
             "scaling": "Spell usage"
         },
         {
-            "id": str(uuid.uuid4()),
             "name": "Guard Counters Activate Holy Attacks",
             "category": "Special Effects",
             "description": "Triggers Holy damage upon successful guard counters.",
@@ -2019,268 +1909,230 @@ def initialize_data():
         }
     ]
     
-    # Clear existing data and insert new
-    bosses_collection.delete_many({})
-    characters_collection.delete_many({})
-    builds_collection.delete_many({})
-    achievements_collection.delete_many({})
-    walkthroughs_collection.delete_many({})
-    user_ratings_collection.delete_many({})
-    custom_builds_collection.delete_many({})
-    creatures_collection.delete_many({})
-    secrets_collection.delete_many({})
-    weapon_skills_collection.delete_many({})
-    weapon_passives_collection.delete_many({})
-    
-    bosses_collection.insert_many(bosses)
-    characters_collection.insert_many(characters)
-    builds_collection.insert_many(builds)
-    achievements_collection.insert_many(achievements)
-    walkthroughs_collection.insert_many(walkthroughs)
-    creatures_collection.insert_many(creatures)
-    secrets_collection.insert_many(secrets)
-    weapon_skills_collection.insert_many(weapon_skills)
-    weapon_passives_collection.insert_many(weapon_passives)
-    
-    # Create text indices for search
-    bosses_collection.create_index([("name", "text"), ("description", "text")])
-    characters_collection.create_index([("name", "text"), ("description", "text")])
-    builds_collection.create_index([("name", "text"), ("description", "text")])
-    achievements_collection.create_index([("name", "text"), ("description", "text")])
-    creatures_collection.create_index([("name", "text"), ("description", "text"), ("type", "text")])
-    secrets_collection.create_index([("name", "text"), ("description", "text"), ("category", "text")])
-    weapon_skills_collection.create_index([("name", "text"), ("description", "text"), ("category", "text")])
-    weapon_passives_collection.create_index([("name", "text"), ("description", "text"), ("category", "text")])
+    # Ids are derived from each entity's type and name so they stay stable
+    return assign_seed_ids({
+        BOSSES: bosses,
+        CHARACTERS: characters,
+        BUILDS: builds,
+        ACHIEVEMENTS: achievements,
+        WALKTHROUGHS: walkthroughs,
+        CREATURES: creatures,
+        SECRETS: secrets,
+        WEAPON_SKILLS: weapon_skills,
+        WEAPON_PASSIVES: weapon_passives,
+    })
+
+# Seed the catalog on startup, skipped when the stored seed version matches,
+# then load the in-memory snapshot the read-only endpoints are served from
+@app.on_event("startup")
+async def startup():
+    await ensure_seed_data(build_seed_data())
+    # Reseeding swaps collections in, so indexes are (re)ensured afterwards
+    if ENSURE_INDEXES:
+        await ensure_indexes()
+    await report_missing_indexes()
+    # Custom builds are indexed for similarity along with the catalog
+    await backfill_submissions()
+    await reload_catalog()
+    await ensure_rating_stats()
+    if RATING_WRITE_BEHIND:
+        rating_buffer.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Buffered ratings must reach Mongo before the client goes away
+    if RATING_WRITE_BEHIND:
+        await rating_buffer.stop()
+    database.close()
+
+def catalog_list_response(collection: str, request: Request):
+    catalog = get_catalog()
+    return body_response(catalog.list_body(collection), request, lambda: {collection: catalog.list(collection)})
 
-# Initialize data on startup
-initialize_data()
+def catalog_detail_response(collection: str, key: str, request: Request, not_found: str):
+    catalog = get_catalog()
+    body = catalog.detail_body(collection, key)
+    if body is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return body_response(body, request, lambda: catalog.get(collection, key))
 
 @app.get("/")
 async def root():
     return {"message": "Elden Ring Nightreign Boss Guide API", "version": "3.0"}
 
+@app.get("/api/bootstrap")
+async def get_bootstrap(request: Request):
+    catalog = get_catalog()
+    return body_response(catalog.bootstrap_body(), request, catalog.bootstrap)
+
 @app.get("/api/bosses")
-async def get_bosses():
-    bosses = list(bosses_collection.find({}, {"_id": 0}))
-    return {"bosses": bosses}
+async def get_bosses(request: Request):
+    return catalog_list_response(BOSSES, request)
 
 @app.get("/api/bosses/{boss_id}")
-async def get_boss(boss_id: str):
-    boss = bosses_collection.find_one({"id": boss_id}, {"_id": 0})
-    if not boss:
-        raise HTTPException(status_code=404, detail="Boss not found")
-    return boss
+async def get_boss(boss_id: str, request: Request):
+    return catalog_detail_response(BOSSES, boss_id, request, "Boss not found")
 
 @app.get("/api/characters")
-async def get_characters():
-    characters = list(characters_collection.find({}, {"_id": 0}))
-    return {"characters": characters}
+async def get_characters(request: Request):
+    return catalog_list_response(CHARACTERS, request)
 
 @app.get("/api/characters/{character_id}")
-async def get_character(character_id: str):
-    character = characters_collection.find_one({"id": character_id}, {"_id": 0})
-    if not character:
+async def get_character(character_id: str, request: Request):
+    return catalog_detail_response(CHARACTERS, character_id, request, "Character not found")
+
+@app.get("/api/characters/{character_id}/full")
+async def get_character_full(character_id: str, request: Request):
+    catalog = get_catalog()
+    body = catalog.character_page_body(character_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Character not found")
-    return character
+    return body_response(body, request, lambda: catalog.character_page(character_id))
 
 @app.get("/api/builds")
-async def get_builds():
-    builds = list(builds_collection.find({}, {"_id": 0}))
-    return {"builds": builds}
+async def get_builds(request: Request):
+    return catalog_list_response(BUILDS, request)
 
 @app.get("/api/builds/{build_id}")
-async def get_build(build_id: str):
-    build = builds_collection.find_one({"id": build_id}, {"_id": 0})
-    if not build:
+async def get_build(build_id: str, request: Request):
+    return catalog_detail_response(BUILDS, build_id, request, "Build not found")
+
+@app.get("/api/builds/{build_id}/similar")
+async def get_similar_builds(
+    build_id: str,
+    limit: int = Query(DEFAULT_SIMILAR_LIMIT, ge=1, le=MAX_SIMILAR_LIMIT)
+):
+    similar = get_similarity_index().similar(BUILDS, build_id, limit)
+    if similar is None:
         raise HTTPException(status_code=404, detail="Build not found")
-    return build
+    return {"build_id": build_id, "similar": similar}
 
 @app.get("/api/achievements")
-async def get_achievements():
-    achievements = list(achievements_collection.find({}, {"_id": 0}).sort("rank", 1))
-    return {"achievements": achievements}
+async def get_achievements(request: Request):
+    return catalog_list_response(ACHIEVEMENTS, request)
 
 @app.get("/api/walkthroughs")
-async def get_walkthroughs():
-    walkthroughs = list(walkthroughs_collection.find({}, {"_id": 0}))
-    return {"walkthroughs": walkthroughs}
+async def get_walkthroughs(request: Request):
+    return catalog_list_response(WALKTHROUGHS, request)
 
 @app.get("/api/walkthroughs/{character_name}")
-async def get_walkthrough(character_name: str):
-    walkthrough = walkthroughs_collection.find_one({"character": character_name}, {"_id": 0})
-    if not walkthrough:
-        raise HTTPException(status_code=404, detail="Walkthrough not found")
-    return walkthrough
+async def get_walkthrough(character_name: str, request: Request):
+    return catalog_detail_response(WALKTHROUGHS, character_name, request, "Walkthrough not found")
 
 @app.get("/api/creatures")
-async def get_creatures():
-    creatures = list(creatures_collection.find({}, {"_id": 0}))
-    return {"creatures": creatures}
+async def get_creatures(request: Request):
+    return catalog_list_response(CREATURES, request)
 
 @app.get("/api/creatures/{creature_id}")
-async def get_creature(creature_id: str):
-    creature = creatures_collection.find_one({"id": creature_id}, {"_id": 0})
-    if not creature:
-        raise HTTPException(status_code=404, detail="Creature not found")
-    return creature
+async def get_creature(creature_id: str, request: Request):
+    return catalog_detail_response(CREATURES, creature_id, request, "Creature not found")
 
 @app.get("/api/secrets")
-async def get_secrets():
-    secrets = list(secrets_collection.find({}, {"_id": 0}))
-    return {"secrets": secrets}
+async def get_secrets(request: Request):
+    return catalog_list_response(SECRETS, request)
 
 @app.get("/api/secrets/{secret_id}")
-async def get_secret(secret_id: str):
-    secret = secrets_collection.find_one({"id": secret_id}, {"_id": 0})
-    if not secret:
-        raise HTTPException(status_code=404, detail="Secret not found")
-    return secret
+async def get_secret(secret_id: str, request: Request):
+    return catalog_detail_response(SECRETS, secret_id, request, "Secret not found")
 
 @app.get("/api/weapon-skills")
-async def get_weapon_skills():
-    weapon_skills = list(weapon_skills_collection.find({}, {"_id": 0}))
-    return {"weapon_skills": weapon_skills}
+async def get_weapon_skills(request: Request):
+    return catalog_list_response(WEAPON_SKILLS, request)
 
 @app.get("/api/weapon-skills/{skill_id}")
-async def get_weapon_skill(skill_id: str):
-    skill = weapon_skills_collection.find_one({"id": skill_id}, {"_id": 0})
-    if not skill:
-        raise HTTPException(status_code=404, detail="Weapon skill not found")
-    return skill
+async def get_weapon_skill(skill_id: str, request: Request):
+    return catalog_detail_response(WEAPON_SKILLS, skill_id, request, "Weapon skill not found")
 
 @app.get("/api/weapon-passives")
-async def get_weapon_passives():
-    weapon_passives = list(weapon_passives_collection.find({}, {"_id": 0}))
-    return {"weapon_passives": weapon_passives}
+async def get_weapon_passives(request: Request):
+    return catalog_list_response(WEAPON_PASSIVES, request)
 
 @app.get("/api/weapon-passives/{passive_id}")
-async def get_weapon_passive(passive_id: str):
-    passive = weapon_passives_collection.find_one({"id": passive_id}, {"_id": 0})
-    if not passive:
-        raise HTTPException(status_code=404, detail="Weapon passive not found")
-    return passive
+async def get_weapon_passive(passive_id: str, request: Request):
+    return catalog_detail_response(WEAPON_PASSIVES, passive_id, request, "Weapon passive not found")
+
+def literal_pattern(value: str):
+    # Client input is matched as a literal, case-insensitive substring
+    return {"$regex": re.escape(value), "$options": "i"}
+
+async def mongo_search(query: str):
+    pattern = literal_pattern(query)
+    
+    # The per-collection queries run concurrently, so latency tracks the slowest one
+    results = await asyncio.gather(*(
+        database.find_all(
+            collection,
+            {"$or": [{field: pattern} for field in fields]},
+            max_time_ms=QUERY_MAX_TIME_MS
+        )
+        for collection, fields in SEARCH_FIELDS.items()
+    ))
+    return dict(zip(SEARCH_FIELDS, results))
 
 @app.get("/api/search")
-async def search(query: str):
+async def search(
+    query: str = Query(..., max_length=MAX_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    cursor: Optional[str] = None,
+    per_type_limit: Optional[int] = Query(None, ge=1),
+    fuzzy: bool = False
+):
     try:
-        # Search across bosses, characters, builds, achievements, and creatures
-        boss_results = list(bosses_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"weaknesses": {"$regex": query, "$options": "i"}},
-                {"damage_types": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        character_results = list(characters_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"abilities": {"$regex": query, "$options": "i"}},
-                {"playstyle": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        build_results = list(builds_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"character": {"$regex": query, "$options": "i"}},
-                {"type": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        achievement_results = list(achievements_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"category": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        creature_results = list(creatures_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"type": {"$regex": query, "$options": "i"}},
-                {"location": {"$regex": query, "$options": "i"}},
-                {"weaknesses": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        secret_results = list(secrets_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"category": {"$regex": query, "$options": "i"}},
-                {"location": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        weapon_skill_results = list(weapon_skills_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"category": {"$regex": query, "$options": "i"}},
-                {"usable_with": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
-        
-        weapon_passive_results = list(weapon_passives_collection.find(
-            {"$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"category": {"$regex": query, "$options": "i"}},
-                {"compatible_characters": {"$regex": query, "$options": "i"}}
-            ]}, 
-            {"_id": 0}
-        ))
+        offset = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    try:
+        if fuzzy:
+            # Typo-tolerant matching is only available from the in-memory index
+            ranked = get_catalog().search_index.rank_fuzzy(query)
+        elif SEARCH_BACKEND == "mongo":
+            ranked = rank_documents(await mongo_search(query), query)
+        else:
+            ranked = get_catalog().search_index.rank(query)
         
         return {
             "query": query,
-            "bosses": boss_results,
-            "characters": character_results,
-            "builds": build_results,
-            "achievements": achievement_results,
-            "creatures": creature_results,
-            "secrets": secret_results,
-            "weapon_skills": weapon_skill_results,
-            "weapon_passives": weapon_passive_results,
-            "total_results": len(boss_results) + len(character_results) + len(build_results) + len(achievement_results) + len(creature_results) + len(secret_results) + len(weapon_skill_results) + len(weapon_passive_results)
+            **paginate(ranked, limit, offset, per_type_limit)
         }
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Search timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+@app.get("/api/autocomplete")
+async def autocomplete(
+    prefix: str = Query(..., max_length=MAX_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_AUTOCOMPLETE_LIMIT, ge=1, le=MAX_AUTOCOMPLETE_LIMIT)
+):
+    return {
+        "prefix": prefix,
+        "completions": get_catalog().autocomplete.complete(prefix, limit)
+    }
+
 @app.get("/api/boss-recommendations/{boss_id}")
-async def get_boss_recommendations(boss_id: str):
-    boss = bosses_collection.find_one({"id": boss_id}, {"_id": 0})
+async def get_boss_recommendations(boss_id: str, request: Request):
+    catalog = get_catalog()
+    body = catalog.recommendations_body(boss_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Boss not found")
+    return body_response(body, request, lambda: catalog.recommendations(boss_id))
+
+@app.get("/api/team-optimizer")
+async def optimize_team(
+    boss_id: str,
+    limit: int = Query(DEFAULT_TEAM_LIMIT, ge=1, le=MAX_TEAM_LIMIT)
+):
+    catalog = get_catalog()
+    boss = catalog.get(BOSSES, boss_id)
     if not boss:
         raise HTTPException(status_code=404, detail="Boss not found")
     
-    # Get recommended characters
-    recommended_characters = list(characters_collection.find(
-        {"name": {"$in": boss["recommended_team"]}},
-        {"_id": 0}
-    ))
-    
-    # Get recommended builds
-    recommended_builds = list(builds_collection.find(
-        {"name": {"$in": boss["recommended_builds"]}},
-        {"_id": 0}
-    ))
-    
     return {
-        "boss": boss,
-        "recommended_characters": recommended_characters,
-        "recommended_builds": recommended_builds
+        "boss_id": boss_id,
+        "boss_name": boss["name"],
+        "weaknesses": boss.get("weaknesses", []),
+        "teams": catalog.team_optimizer.best_teams(boss_id, limit)
     }
 
 @app.post("/api/rate-boss")
@@ -2289,46 +2141,100 @@ async def rate_boss(boss_id: str, rating: int, user_id: str = "anonymous"):
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 10")
     
     # Check if boss exists
-    boss = bosses_collection.find_one({"id": boss_id}, {"_id": 0})
+    boss = get_catalog().get(BOSSES, boss_id)
     if not boss:
         raise HTTPException(status_code=404, detail="Boss not found")
     
-    # Insert or update rating
-    user_ratings_collection.update_one(
-        {"user_id": user_id, "boss_id": boss_id},
-        {"$set": {"rating": rating, "timestamp": datetime.now()}},
-        upsert=True
-    )
+    if RATING_WRITE_BEHIND:
+        rating_buffer.add(boss_id, user_id, rating)
+        return JSONResponse(status_code=202, content={
+            "message": "Rating accepted",
+            "queued": True
+        })
     
-    # Calculate average rating
-    ratings = list(user_ratings_collection.find({"boss_id": boss_id}))
-    avg_rating = sum(r["rating"] for r in ratings) / len(ratings)
+    # Insert or update rating; the boss's running aggregate is updated in O(1)
+    stats = await record_rating(boss_id, user_id, rating)
     
     return {
         "message": "Rating submitted successfully",
-        "average_rating": round(avg_rating, 1),
-        "total_ratings": len(ratings)
+        "average_rating": average_rating(stats),
+        "total_ratings": stats["count"]
     }
 
+@app.get("/api/boss-ratings")
+async def get_boss_ratings():
+    # Served from the incrementally maintained aggregates, never from user_ratings
+    stats = await get_all_rating_stats()
+    ratings = [
+        rating_summary(stats.get(boss["id"], {}), boss)
+        for boss in get_catalog().list(BOSSES)
+    ]
+    ratings.sort(key=lambda summary: (-summary["average_rating"], -summary["total_ratings"]))
+    return {"boss_ratings": ratings}
+
+@app.get("/api/boss-ratings/{boss_id}")
+async def get_boss_rating(boss_id: str):
+    boss = get_catalog().get(BOSSES, boss_id)
+    if not boss:
+        raise HTTPException(status_code=404, detail="Boss not found")
+    return rating_summary(await get_rating_stats(boss_id), boss)
+
 @app.post("/api/custom-build")
-async def create_custom_build(build_data: dict):
-    build_data["id"] = str(uuid.uuid4())
-    build_data["created_at"] = datetime.now()
-    build_data["user_id"] = build_data.get("user_id", "anonymous")
+async def create_custom_build(build: CustomBuildCreate):
+    stored = await store_custom_build(build.to_document())
+    duplicate = stored["submission_count"] > 1
+    if not duplicate:
+        get_similarity_index().add(CUSTOM_BUILDS, stored)
     
-    custom_builds_collection.insert_one(build_data)
-    
-    return {"message": "Custom build created successfully", "build_id": build_data["id"]}
+    return {
+        "message": "Identical custom build already exists" if duplicate else "Custom build created successfully",
+        "build_id": stored["id"],
+        "duplicate": duplicate,
+        "submission_count": stored["submission_count"],
+    }
 
 @app.get("/api/custom-builds")
-async def get_custom_builds():
-    builds = list(custom_builds_collection.find({}, {"_id": 0}))
-    return {"custom_builds": builds}
+async def get_custom_builds(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    character: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
+    user_id: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
+    view: str = Query("summary", pattern="^(summary|full)$")
+):
+    try:
+        return await list_custom_builds(limit, cursor, character, user_id, summary=view == "summary")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Custom build listing timed out")
+
+@app.get("/api/custom-builds/{build_id}")
+async def get_custom_build_detail(build_id: str):
+    build = await get_custom_build(build_id)
+    if not build:
+        raise HTTPException(status_code=404, detail="Custom build not found")
+    return build
+
+@app.get("/api/custom-builds/{build_id}/similar")
+async def get_similar_custom_builds(
+    build_id: str,
+    limit: int = Query(DEFAULT_SIMILAR_LIMIT, ge=1, le=MAX_SIMILAR_LIMIT)
+):
+    index = get_similarity_index()
+    similar = index.similar(CUSTOM_BUILDS, build_id, limit)
+    if similar is None:
+        # Submitted to another worker after this one loaded its index
+        build = await get_custom_build(build_id)
+        if not build:
+            raise HTTPException(status_code=404, detail="Custom build not found")
+        index.add(CUSTOM_BUILDS, build)
+        similar = index.similar(CUSTOM_BUILDS, build_id, limit)
+    return {"build_id": build_id, "similar": similar}
 
 @app.get("/api/filter-bosses")
 async def filter_bosses(
     difficulty: Optional[str] = None,
-    weakness: Optional[str] = None,
+    weakness: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
     min_level: Optional[int] = None,
     max_level: Optional[int] = None
 ):
@@ -2353,43 +2259,52 @@ async def filter_bosses(
     if max_level is not None:
         filter_criteria["max_level"] = {"$lte": max_level}
     
-    bosses = list(bosses_collection.find(filter_criteria, {"_id": 0}))
+    try:
+        bosses = await database.find_all(BOSSES, filter_criteria, max_time_ms=QUERY_MAX_TIME_MS)
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Filter timed out")
     return {"bosses": bosses, "filters_applied": filter_criteria}
 
 @app.get("/api/filter-characters")
 async def filter_characters(
-    playstyle: Optional[str] = None,
-    primary_stat: Optional[str] = None
+    playstyle: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
+    primary_stat: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH)
 ):
     filter_criteria = {}
     
     if playstyle:
-        filter_criteria["playstyle"] = {"$regex": playstyle, "$options": "i"}
+        filter_criteria["playstyle"] = literal_pattern(playstyle)
     
     if primary_stat:
-        filter_criteria["primary_stat"] = {"$regex": primary_stat, "$options": "i"}
+        filter_criteria["primary_stat"] = literal_pattern(primary_stat)
     
-    characters = list(characters_collection.find(filter_criteria, {"_id": 0}))
+    try:
+        characters = await database.find_all(CHARACTERS, filter_criteria, max_time_ms=QUERY_MAX_TIME_MS)
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Filter timed out")
     return {"characters": characters, "filters_applied": filter_criteria}
 
 @app.get("/api/filter-creatures")
 async def filter_creatures(
-    type: Optional[str] = None,
-    threat_level: Optional[str] = None,
-    weakness: Optional[str] = None
+    type: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
+    threat_level: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH),
+    weakness: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH)
 ):
     filter_criteria = {}
     
     if type:
-        filter_criteria["type"] = {"$regex": type, "$options": "i"}
+        filter_criteria["type"] = literal_pattern(type)
     
     if threat_level:
-        filter_criteria["threat_level"] = {"$regex": threat_level, "$options": "i"}
+        filter_criteria["threat_level"] = literal_pattern(threat_level)
     
     if weakness:
         filter_criteria["weaknesses"] = {"$in": [weakness]}
     
-    creatures = list(creatures_collection.find(filter_criteria, {"_id": 0}))
+    try:
+        creatures = await database.find_all(CREATURES, filter_criteria, max_time_ms=QUERY_MAX_TIME_MS)
+    except ExecutionTimeout:
+        raise HTTPException(status_code=503, detail="Filter timed out")
     return {"creatures": creatures, "filters_applied": filter_criteria}
 
 if __name__ == "__main__":
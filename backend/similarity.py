@@ -0,0 +1,202 @@
+"""Similar-build ("builds like this") lookups over catalog and custom builds.
+
+Every build becomes one row of a float32 embedding matrix: one-hot blocks
+for talismans, weapons, build type and character, plus the
+recommended_stats vector. Blocks are normalised and weighted separately,
+and each row has unit length, so the cosine similarity of one build with
+all others is a single matrix-vector product followed by a top-k
+partition.
+
+Names used by the catalog builds get a column each. Names only seen in
+custom builds are hashed into a small overflow block instead, so new rows
+can be appended without widening the matrix. The matrix keeps spare
+capacity and doubles when it fills up.
+"""
+import logging
+import math
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import database
+from database import BUILDS, CUSTOM_BUILDS
+from models import STAT_NAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILAR_LIMIT = 10
+MAX_SIMILAR_LIMIT = 50
+
+# Relative weight of each block in the cosine
+TALISMAN_WEIGHT = 1.0
+WEAPON_WEIGHT = 1.0
+STATS_WEIGHT = 1.0
+TYPE_WEIGHT = 0.5
+CHARACTER_WEIGHT = 0.5
+
+# Columns shared by names the catalog builds never use
+OVERFLOW_BUCKETS = 32
+
+WEAPON_FIELDS = ("primary_weapon", "secondary_weapon")
+
+# Only what the similarity index needs from stored custom builds
+CUSTOM_BUILD_PROJECTION = {
+    field: 1
+    for field in ("id", "name", "character", "type", "talismans", "recommended_stats", *WEAPON_FIELDS)
+}
+
+INITIAL_CAPACITY = 1024
+
+
+class Entry(NamedTuple):
+    collection: str
+    id: str
+    name: str
+    character: str
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _names(build: Dict[str, Any], block: str) -> List[str]:
+    if block == "talismans":
+        values = build.get("talismans")
+        if not isinstance(values, list):
+            values = [values]
+    elif block == "weapons":
+        values = [build.get(field) for field in WEAPON_FIELDS]
+    else:
+        values = [build.get(block)]
+    # Legacy custom builds may hold anything; only names count
+    return [_normalize(value) for value in values if isinstance(value, str) and value]
+
+
+def _stat(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    return 0.0
+
+
+class OneHotBlock:
+    """Exact columns for a fixed vocabulary, hashed overflow columns for the rest."""
+
+    def __init__(self, vocabulary: Iterable[str], weight: float):
+        self._columns = {name: column for column, name in enumerate(sorted(set(vocabulary)))}
+        self.width = len(self._columns) + OVERFLOW_BUCKETS
+        self.weight = weight
+
+    def encode(self, names: Iterable[str]) -> np.ndarray:
+        block = np.zeros(self.width, dtype=np.float32)
+        for name in names:
+            column = self._columns.get(name)
+            if column is None:
+                # crc32 rather than hash(), which is salted per process
+                column = len(self._columns) + zlib.crc32(name.encode("utf-8")) % OVERFLOW_BUCKETS
+            block[column] = 1.0
+        return block
+
+
+class SimilarityIndex:
+    def __init__(self, catalog_builds: Iterable[Dict[str, Any]] = ()):
+        catalog_builds = list(catalog_builds)
+        self._blocks = {
+            block: OneHotBlock((name for build in catalog_builds for name in _names(build, block)), weight)
+            for block, weight in (
+                ("talismans", TALISMAN_WEIGHT),
+                ("weapons", WEAPON_WEIGHT),
+                ("type", TYPE_WEIGHT),
+                ("character", CHARACTER_WEIGHT),
+            )
+        }
+        self._dimensions = len(STAT_NAMES) + sum(block.width for block in self._blocks.values())
+        self._matrix = np.zeros((INITIAL_CAPACITY, self._dimensions), dtype=np.float32)
+        self._entries: List[Entry] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        for build in catalog_builds:
+            self.add(BUILDS, build)
+
+    def embed(self, build: Dict[str, Any]) -> np.ndarray:
+        """Unit-length embedding of a build document."""
+        stats = build.get("recommended_stats")
+        if not isinstance(stats, dict):
+            stats = {}
+        parts = [(np.array([_stat(stats.get(stat)) for stat in STAT_NAMES], dtype=np.float32), STATS_WEIGHT)]
+        for name, block in self._blocks.items():
+            parts.append((block.encode(_names(build, name)), block.weight))
+        weighted = []
+        for part, weight in parts:
+            norm = np.linalg.norm(part)
+            weighted.append(part * (weight / norm) if norm else part)
+        vector = np.concatenate(weighted)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, collection: str, build: Dict[str, Any]) -> None:
+        """Append a build; a build already in the index is left as it is."""
+        key = (collection, build["id"])
+        if key in self._rows:
+            return
+        row = len(self._entries)
+        if row == len(self._matrix):
+            grown = np.zeros((2 * len(self._matrix), self._dimensions), dtype=np.float32)
+            grown[:row] = self._matrix
+            self._matrix = grown
+        self._matrix[row] = self.embed(build)
+        self._entries.append(Entry(collection, build["id"], build.get("name", ""), build.get("character", "")))
+        self._rows[key] = row
+
+    def similar(
+        self,
+        collection: str,
+        build_id: str,
+        limit: int = DEFAULT_SIMILAR_LIMIT,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """The ``limit`` builds closest to the given one, best first, or
+        None when the build is not indexed."""
+        row = self._rows.get((collection, build_id))
+        if row is None:
+            return None
+        count = len(self._entries)
+        scores = self._matrix[:count] @ self._matrix[row]
+        scores[row] = -np.inf
+        limit = min(limit, count - 1)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "type": self._entries[position].collection,
+                "id": self._entries[position].id,
+                "name": self._entries[position].name,
+                "character": self._entries[position].character,
+                "similarity": round(float(scores[position]), 4),
+            }
+            for position in top
+        ]
+
+
+_index: Optional[SimilarityIndex] = None
+
+
+async def load_similarity_index(catalog_builds: Iterable[Dict[str, Any]]) -> SimilarityIndex:
+    """Index the catalog builds and every stored custom build. A custom
+    build that cannot be embedded is logged and left out."""
+    global _index
+    custom_builds = await database.find_all(CUSTOM_BUILDS, projection=CUSTOM_BUILD_PROJECTION)
+    index = SimilarityIndex(catalog_builds)
+    for build in custom_builds:
+        try:
+            index.add(CUSTOM_BUILDS, build)
+        except Exception:
+            logger.exception("Leaving custom build %s out of the similarity index", build.get("id"))
+    _index = index
+    return _index
+
+
+def get_similarity_index() -> SimilarityIndex:
+    if _index is None:
+        raise RuntimeError("Similarity index has not been loaded")
+    return _index
@@ -0,0 +1,149 @@
+"""Best three-character teams against a boss.
+
+Every 3-of-N team is scored on three things: how many of the boss's
+weaknesses some member's damage types exploit, how many distinct roles the
+team covers, and how much of it the boss's hand-written recommended_team
+agrees with. Characters are turned into matrices once per catalog snapshot
+(characters x damage types, characters x roles, characters x bosses), so
+scoring all teams for a boss is a handful of NumPy reductions over a
+teams x 3 index array. Rankings are cached per boss for the snapshot's
+lifetime.
+"""
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+
+from database import BOSSES, CHARACTERS
+from graph import CatalogGraph
+
+TEAM_SIZE = 3
+
+DEFAULT_TEAM_LIMIT = 5
+MAX_TEAM_LIMIT = 50
+
+# Weight of each component in a team's score; they sum to 1
+WEAKNESS_WEIGHT = 0.5
+ROLE_WEIGHT = 0.3
+RECOMMENDED_WEIGHT = 0.2
+
+# Character damage types that exploit more than their own name
+DAMAGE_TYPE_COVERAGE = {"elemental": ("magic", "fire", "lightning", "holy")}
+
+# Team role of each playstyle; anything else fights in melee
+ROLE_BY_PLAYSTYLE = {
+    "Tank": "tank",
+    "Support": "support",
+    "Spellcaster": "ranged",
+    "Marksman": "ranged",
+}
+ROLES = ("melee", "ranged", "tank", "support")
+
+
+def _damage_types(values: Iterable[str]) -> List[str]:
+    covered: List[str] = []
+    for value in values:
+        value = value.lower()
+        for damage_type in (value, *DAMAGE_TYPE_COVERAGE.get(value, ())):
+            if damage_type not in covered:
+                covered.append(damage_type)
+    return covered
+
+
+def role(character: Dict[str, Any]) -> str:
+    return ROLE_BY_PLAYSTYLE.get(character.get("playstyle"), "melee")
+
+
+class TeamOptimizer:
+    def __init__(self, documents: Mapping[str, Iterable[Dict[str, Any]]], graph: CatalogGraph):
+        self._characters = list(documents.get(CHARACTERS, ()))
+        bosses = list(documents.get(BOSSES, ()))
+        self._boss_index = {boss["id"]: position for position, boss in enumerate(bosses)}
+        self._weaknesses = [list(boss.get("weaknesses", ())) for boss in bosses]
+
+        damage_types = sorted({damage_type
+                               for character in self._characters
+                               for damage_type in _damage_types(character.get("damage_types", ()))}
+                              | {weakness.lower() for weaknesses in self._weaknesses for weakness in weaknesses})
+        column = {damage_type: position for position, damage_type in enumerate(damage_types)}
+
+        # characters x damage types: 1 where the character deals that damage
+        self._hits = np.zeros((len(self._characters), len(damage_types)), dtype=np.float32)
+        # characters x roles, one-hot
+        self._roles = np.zeros((len(self._characters), len(ROLES)), dtype=np.float32)
+        character_index = {}
+        for position, character in enumerate(self._characters):
+            character_index[character["id"]] = position
+            for damage_type in _damage_types(character.get("damage_types", ())):
+                self._hits[position, column[damage_type]] = 1.0
+            self._roles[position, ROLES.index(role(character))] = 1.0
+
+        # characters x bosses: 1 where the boss's recommended_team names the character
+        self._recommended = np.zeros((len(self._characters), len(bosses)), dtype=np.float32)
+        for boss_position, boss in enumerate(bosses):
+            for character_id in graph.linked_ids(BOSSES, "recommended_team", boss["id"]):
+                self._recommended[character_index[character_id], boss_position] = 1.0
+
+        # boss weakness columns, and characters x bosses share of weaknesses hit
+        self._weakness_columns = [np.array([column[weakness.lower()] for weakness in weaknesses], dtype=np.intp)
+                                  for weaknesses in self._weaknesses]
+        weakness_matrix = np.zeros((len(bosses), len(damage_types)), dtype=np.float32)
+        for boss_position, columns in enumerate(self._weakness_columns):
+            weakness_matrix[boss_position, columns] = 1.0
+        counts = np.maximum(weakness_matrix.sum(axis=1), 1.0)
+        self._affinity = (self._hits @ weakness_matrix.T) / counts
+
+        # teams x TEAM_SIZE character positions
+        self._teams = np.array(list(combinations(range(len(self._characters)), TEAM_SIZE)),
+                               dtype=np.intp).reshape(-1, TEAM_SIZE)
+        self._rankings: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _rank(self, boss_position: int) -> List[Dict[str, Any]]:
+        teams = self._teams
+        columns = self._weakness_columns[boss_position]
+        if len(columns):
+            # teams x members x weaknesses -> share of weaknesses some member hits
+            covered = self._hits[:, columns][teams].max(axis=1)
+            weakness_coverage = covered.mean(axis=1)
+        else:
+            covered = np.zeros((len(teams), 0), dtype=np.float32)
+            weakness_coverage = np.zeros(len(teams), dtype=np.float32)
+        role_coverage = self._roles[teams].max(axis=1).sum(axis=1) / min(TEAM_SIZE, len(ROLES))
+        recommended = self._recommended[teams, boss_position].mean(axis=1)
+        scores = (WEAKNESS_WEIGHT * weakness_coverage
+                  + ROLE_WEIGHT * role_coverage
+                  + RECOMMENDED_WEIGHT * recommended)
+
+        # Stable sort keeps combination order among equal scores; only the
+        # teams a request can ask for are materialised
+        order = np.argsort(-scores, kind="stable")[:MAX_TEAM_LIMIT]
+        weaknesses = self._weaknesses[boss_position]
+        return [
+            {
+                "characters": [
+                    {
+                        "id": self._characters[member]["id"],
+                        "name": self._characters[member]["name"],
+                        "role": ROLES[int(self._roles[member].argmax())],
+                        "weakness_affinity": round(float(self._affinity[member, boss_position]), 3),
+                    }
+                    for member in teams[team]
+                ],
+                "score": round(float(scores[team]), 3),
+                "breakdown": {
+                    "weakness_coverage": round(float(weakness_coverage[team]), 3),
+                    "role_coverage": round(float(role_coverage[team]), 3),
+                    "recommended": round(float(recommended[team]), 3),
+                },
+                "covered_weaknesses": [weakness for weakness, hit in zip(weaknesses, covered[team]) if hit],
+            }
+            for team in order
+        ]
+
+    def best_teams(self, boss_id: str, limit: int = DEFAULT_TEAM_LIMIT) -> List[Dict[str, Any]]:
+        """Teams ranked best first; raises KeyError for an unknown boss."""
+        rankings = self._rankings.get(boss_id)
+        if rankings is None:
+            rankings = self._rank(self._boss_index[boss_id])
+            self._rankings[boss_id] = rankings
+        return rankings[:limit]
@@ -3,6 +3,7 @@ import unittest
 import sys
 import os
 import json
+import time
 import uuid
 
 class EldenRingNightReignAPITest(unittest.TestCase):
@@ -547,6 +548,323 @@ class EldenRingNightReignAPITest(unittest.TestCase):
         print(f"   Found {len(data['weapon_skills'])} weapon skills matching '{search_term}'")
         print(f"   Found {len(data['weapon_passives'])} weapon passives matching '{search_term}'")
 
+    def test_24_bootstrap(self):
+        """Test the aggregate bootstrap endpoint"""
+        print("\n🔍 Testing bootstrap endpoint...")
+        response = requests.get(f"{self.base_url}/api/bootstrap")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("version", data)
+        for key in ["bosses", "characters", "builds", "achievements", "walkthroughs",
+                    "creatures", "secrets", "weapon_skills", "weapon_passives"]:
+            self.assertIn(key, data)
+            self.assertIsInstance(data[key], list)
+        self.assertEqual(len(data["bosses"]), 8, "Should have exactly 8 bosses")
+        
+        # The catalog lists match the individual endpoints
+        response = requests.get(f"{self.base_url}/api/achievements")
+        self.assertEqual(data["achievements"], response.json()["achievements"])
+        print(f"✅ Bootstrap test passed - Catalog version {data['version']}")
+
+    def test_25_autocomplete(self):
+        """Test typeahead completions over entity names"""
+        print("\n🔍 Testing autocomplete...")
+        response = requests.get(f"{self.base_url}/api/autocomplete?prefix=gla")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("completions", data)
+        self.assertGreater(len(data["completions"]), 0)
+        for completion in data["completions"]:
+            self.assertIn("type", completion)
+            self.assertIn("id", completion)
+            self.assertIn("gla", completion["name"].lower())
+        
+        # Limit is honoured
+        response = requests.get(f"{self.base_url}/api/autocomplete?prefix=night&limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.json()["completions"]), 2)
+        print(f"✅ Autocomplete test passed - First completion: {data['completions'][0]['name']}")
+
+    def test_26_boss_ratings(self):
+        """Test the boss rating leaderboard and per-boss stats"""
+        print("\n🔍 Testing boss ratings...")
+        response = requests.get(f"{self.base_url}/api/bosses")
+        boss_id = response.json()["bosses"][0]["id"]
+        
+        response = requests.post(f"{self.base_url}/api/rate-boss?boss_id={boss_id}&rating=8&user_id=test-{uuid.uuid4()}")
+        self.assertIn(response.status_code, [200, 202])
+        
+        response = requests.get(f"{self.base_url}/api/boss-ratings")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn("boss_ratings", data)
+        self.assertEqual(len(data["boss_ratings"]), 8, "Should rate all 8 Nightlords")
+        
+        response = requests.get(f"{self.base_url}/api/boss-ratings/{boss_id}")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for key in ["boss_id", "boss_name", "average_rating", "total_ratings", "distribution"]:
+            self.assertIn(key, data)
+        self.assertEqual(len(data["distribution"]), 10)
+        print(f"✅ Boss ratings test passed - {data['boss_name']}: {data['average_rating']} from {data['total_ratings']} ratings")
+
+    def test_27_custom_build_dedupe(self):
+        """Test that identical custom builds are stored once"""
+        print("\n🔍 Testing custom build deduplication...")
+        build = {
+            "name": f"Dedupe Test {uuid.uuid4()}",
+            "character": "Wylder",
+            "talismans": ["Crimson Amber Medallion", "Dragoncrest Shield"]
+        }
+        first = requests.post(f"{self.base_url}/api/custom-build", json={**build, "user_id": "dedupe-a"}).json()
+        reordered = {**build, "talismans": list(reversed(build["talismans"])), "user_id": "dedupe-b"}
+        second = requests.post(f"{self.base_url}/api/custom-build", json=reordered).json()
+        
+        self.assertEqual(first["build_id"], second["build_id"])
+        self.assertFalse(first["duplicate"])
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(second["submission_count"], 2)
+        print(f"✅ Custom build dedupe test passed - {second['submission_count']} submissions of one build")
+
+    def test_28_character_full(self):
+        """Test the character page aggregate endpoint"""
+        print("\n🔍 Testing character full endpoint...")
+        response = requests.get(f"{self.base_url}/api/characters")
+        character = response.json()["characters"][0]
+        
+        response = requests.get(f"{self.base_url}/api/characters/{character['id']}/full")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for key in ["character", "builds", "walkthrough", "weapon_passives", "recommended_against"]:
+            self.assertIn(key, data)
+        self.assertEqual(data["character"]["id"], character["id"])
+        self.assertEqual(data["walkthrough"]["character"], character["name"])
+        
+        response = requests.get(f"{self.base_url}/api/characters/non-existent-id/full")
+        self.assertEqual(response.status_code, 404)
+        print(f"✅ Character full test passed - {character['name']}: {len(data['builds'])} builds, {len(data['weapon_passives'])} passives")
+
+    def test_29_team_optimizer(self):
+        """Test the team composition optimizer"""
+        print("\n🔍 Testing team optimizer...")
+        response = requests.get(f"{self.base_url}/api/bosses")
+        boss = response.json()["bosses"][0]
+        
+        response = requests.get(f"{self.base_url}/api/team-optimizer?boss_id={boss['id']}&limit=3")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["boss_id"], boss["id"])
+        self.assertEqual(len(data["teams"]), 3)
+        best = data["teams"][0]
+        self.assertEqual(len(best["characters"]), 3)
+        for key in ["weakness_coverage", "role_coverage", "recommended"]:
+            self.assertIn(key, best["breakdown"])
+        scores = [team["score"] for team in data["teams"]]
+        self.assertEqual(scores, sorted(scores, reverse=True), "Teams should be ranked best first")
+        
+        response = requests.get(f"{self.base_url}/api/team-optimizer?boss_id=non-existent-id")
+        self.assertEqual(response.status_code, 404)
+        print(f"✅ Team optimizer test passed - best team vs {boss['name']}: {[c['name'] for c in best['characters']]} ({best['score']})")
+
+    def test_30_similar_builds(self):
+        """Test build similarity recommendations"""
+        print("\n🔍 Testing similar builds...")
+        response = requests.get(f"{self.base_url}/api/builds")
+        build = response.json()["builds"][0]
+        
+        response = requests.get(f"{self.base_url}/api/builds/{build['id']}/similar?limit=5")
+        self.assertEqual(response.status_code, 200)
+        similar = response.json()["similar"]
+        self.assertEqual(len(similar), 5)
+        self.assertNotIn(build["id"], [item["id"] for item in similar])
+        scores = [item["similarity"] for item in similar]
+        self.assertEqual(scores, sorted(scores, reverse=True), "Similar builds should be ranked best first")
+        
+        # Every embedded field is copied and the name is fixed, so repeated
+        # runs resubmit one deduplicated clone that embeds exactly like the build
+        embedded = ["character", "type", "primary_weapon", "secondary_weapon", "talismans", "recommended_stats"]
+        clone = {key: build[key] for key in embedded if key in build}
+        clone["name"] = f"Similarity Test {build['name']}"
+        build_id = requests.post(f"{self.base_url}/api/custom-build", json=clone).json()["build_id"]
+        response = requests.get(f"{self.base_url}/api/custom-builds/{build_id}/similar?limit=5")
+        self.assertEqual(response.status_code, 200)
+        matches = {item["id"]: item["similarity"] for item in response.json()["similar"]}
+        self.assertIn(build["id"], matches)
+        self.assertEqual(matches[build["id"]], 1.0)
+        
+        response = requests.get(f"{self.base_url}/api/builds/non-existent-id/similar")
+        self.assertEqual(response.status_code, 404)
+        print(f"✅ Similar builds test passed - closest to {build['name']}: {similar[0]['name']} ({similar[0]['similarity']})")
+
+    def test_31_catalog_etags(self):
+        """Test ETag and Cache-Control validators on catalog endpoints"""
+        print("\n🔍 Testing catalog validators...")
+        for path in ["/api/bosses", "/api/bootstrap"]:
+            response = requests.get(f"{self.base_url}{path}")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("ETag", response.headers)
+            self.assertIn("max-age", response.headers.get("Cache-Control", ""))
+            
+            response = requests.get(f"{self.base_url}{path}", headers={"If-None-Match": response.headers["ETag"]})
+            self.assertEqual(response.status_code, 304)
+            
+            response = requests.get(f"{self.base_url}{path}", headers={"If-None-Match": '"stale"'})
+            self.assertEqual(response.status_code, 200)
+        print("✅ Catalog validators test passed - matching If-None-Match returns 304")
+
+    def test_32_custom_build_paging(self):
+        """Test keyset pagination of custom builds"""
+        print("\n🔍 Testing custom build paging...")
+        character = f"Paging-{uuid.uuid4()}"
+        created = []
+        for index in range(5):
+            response = requests.post(f"{self.base_url}/api/custom-build", json={"name": f"Page Build {index}", "character": character})
+            self.assertEqual(response.status_code, 200)
+            created.append(response.json()["build_id"])
+        
+        pages = []
+        cursor = None
+        while True:
+            params = {"character": character, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{self.base_url}/api/custom-builds", params=params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([build["id"] for build in data["custom_builds"]])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        seen = [build_id for page in pages for build_id in page]
+        self.assertEqual(len(seen), len(set(seen)), "Pages should not overlap")
+        self.assertEqual(seen, list(reversed(created)), "Pages should run newest first")
+        
+        response = requests.get(f"{self.base_url}/api/custom-builds", params={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        print(f"✅ Custom build paging test passed - {len(seen)} builds over {len(pages)} pages")
+
+    def test_33_custom_build_validation(self):
+        """Test that malformed custom builds are rejected"""
+        print("\n🔍 Testing custom build validation...")
+        valid = {"name": f"Validation Test {uuid.uuid4()}", "character": "Wylder"}
+        invalid = {
+            "unknown field": {**valid, "is_admin": True},
+            "oversized description": {**valid, "description": "x" * 5000},
+            "oversized name": {**valid, "name": "x" * 101},
+            "too many talismans": {**valid, "talismans": [f"Talisman {i}" for i in range(7)]},
+            "unknown stat": {**valid, "recommended_stats": {"Luck": 10}},
+            "stat out of range": {**valid, "recommended_stats": {"Vigor": 100}},
+            "missing name": {"character": "Wylder"},
+        }
+        for label, body in invalid.items():
+            response = requests.post(f"{self.base_url}/api/custom-build", json=body)
+            self.assertEqual(response.status_code, 422, f"Expected 422 for {label}")
+        
+        response = requests.post(f"{self.base_url}/api/custom-build", json={**valid, "recommended_stats": {"Vigor": 40}})
+        self.assertEqual(response.status_code, 200)
+        print(f"✅ Custom build validation test passed - {len(invalid)} malformed bodies rejected")
+
+    def test_34_boss_rerating(self):
+        """Test that re-rating a boss replaces the user's vote"""
+        print("\n🔍 Testing boss re-rating...")
+        boss_id = requests.get(f"{self.base_url}/api/bosses").json()["bosses"][-1]["id"]
+        user_id = f"rerate-{uuid.uuid4()}"
+        
+        def summary():
+            data = requests.get(f"{self.base_url}/api/boss-ratings/{boss_id}").json()
+            total = sum(data["distribution"].values())
+            rating_sum = sum(int(rating) * count for rating, count in data["distribution"].items())
+            return data, total, rating_sum
+        
+        _, base_total, base_sum = summary()
+        for rating in [8, 3]:
+            response = requests.post(f"{self.base_url}/api/rate-boss?boss_id={boss_id}&rating={rating}&user_id={user_id}")
+            self.assertIn(response.status_code, [200, 202])
+            if response.status_code == 200:
+                self.assertEqual(response.json()["total_ratings"], base_total + 1)
+        if response.status_code == 202:
+            time.sleep(3)  # let the write-behind buffer flush
+        
+        data, total, rating_sum = summary()
+        # On a fresh database this is total_ratings 1 with an average of 3.0
+        self.assertEqual(data["total_ratings"], base_total + 1, "A re-rating should not add a vote")
+        self.assertEqual(rating_sum, base_sum + 3, "Only the latest rating should count")
+        self.assertEqual(data["average_rating"], round(rating_sum / total, 1))
+        print(f"✅ Boss re-rating test passed - {data['boss_name']}: {data['average_rating']} from {data['total_ratings']} ratings")
+
+    def test_35_fuzzy_search(self):
+        """Test typo-tolerant search"""
+        print("\n🔍 Testing fuzzy search...")
+        response = requests.get(f"{self.base_url}/api/search", params={"query": "Gnostr"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_results"], 0, "A misspelling should not match exactly")
+        
+        expected = {"Gnostr": "Gnoster, Wisdom of Night", "Ironeye marksmen": "Ironeye Marksman"}
+        for query, name in expected.items():
+            response = requests.get(f"{self.base_url}/api/search", params={"query": query, "fuzzy": "true"})
+            self.assertEqual(response.status_code, 200)
+            results = response.json()["results"]
+            self.assertTrue(results, f"Fuzzy search for {query!r} should match")
+            self.assertEqual(results[0]["name"], name)
+        print(f"✅ Fuzzy search test passed - {len(expected)} misspellings resolved")
+
+    def test_36_search_paging(self):
+        """Test ranked, cursor-paginated search results"""
+        print("\n🔍 Testing search paging...")
+        response = requests.get(f"{self.base_url}/api/search", params={"query": "holy", "limit": 200})
+        self.assertEqual(response.status_code, 200)
+        everything = response.json()
+        self.assertIsNone(everything["next_cursor"])
+        scores = [result["score"] for result in everything["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True), "Results should be ranked best first")
+        
+        pages = []
+        cursor = None
+        while True:
+            params = {"query": "holy", "limit": 4}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{self.base_url}/api/search", params=params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data["results"]), 4)
+            pages.append([(result["type"], result["id"]) for result in data["results"]])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        seen = [result for page in pages for result in page]
+        self.assertEqual(len(seen), len(set(seen)), "Pages should not overlap")
+        self.assertEqual(seen, [(result["type"], result["id"]) for result in everything["results"]])
+        self.assertEqual(len(seen), everything["total_results"])
+        
+        response = requests.get(f"{self.base_url}/api/search", params={"query": "holy", "limit": 200, "per_type_limit": 2})
+        self.assertEqual(response.status_code, 200)
+        types = [result["type"] for result in response.json()["results"]]
+        self.assertTrue(all(types.count(kind) <= 2 for kind in types), "per_type_limit should cap each type")
+        
+        response = requests.get(f"{self.base_url}/api/search", params={"query": "holy", "cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        print(f"✅ Search paging test passed - {len(seen)} results over {len(pages)} pages")
+
+    def test_37_literal_search_input(self):
+        """Test that search input is matched literally and length-limited"""
+        print("\n🔍 Testing literal search input...")
+        pattern = "(a+)+$"
+        response = requests.get(f"{self.base_url}/api/search", params={"query": pattern})
+        self.assertEqual(response.status_code, 200)
+        response = requests.get(f"{self.base_url}/api/filter-characters", params={"playstyle": pattern})
+        self.assertEqual(response.status_code, 200)
+        
+        too_long = "x" * 101
+        response = requests.get(f"{self.base_url}/api/search", params={"query": too_long})
+        self.assertEqual(response.status_code, 422)
+        response = requests.get(f"{self.base_url}/api/filter-characters", params={"playstyle": too_long})
+        self.assertEqual(response.status_code, 422)
+        print("✅ Literal search input test passed - regex syntax is inert, long queries rejected")
+
 if __name__ == "__main__":
     # Run the tests
     test_suite = unittest.TestSuite()
@@ -573,6 +891,20 @@ if __name__ == "__main__":
     test_suite.addTest(EldenRingNightReignAPITest('test_21_get_secrets'))
     test_suite.addTest(EldenRingNightReignAPITest('test_22_get_weapon_skills'))
     test_suite.addTest(EldenRingNightReignAPITest('test_23_get_weapon_passives'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_24_bootstrap'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_25_autocomplete'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_26_boss_ratings'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_27_custom_build_dedupe'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_28_character_full'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_29_team_optimizer'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_30_similar_builds'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_31_catalog_etags'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_32_custom_build_paging'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_33_custom_build_validation'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_34_boss_rerating'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_35_fuzzy_search'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_36_search_paging'))
+    test_suite.addTest(EldenRingNightReignAPITest('test_37_literal_search_input'))
     
     runner = unittest.TextTestRunner()
     result = runner.run(test_suite)
@@ -9,6 +9,7 @@ function App() {
   const [achievements, setAchievements] = useState([]);
   const [walkthroughs, setWalkthroughs] = useState([]);
   const [customBuilds, setCustomBuilds] = useState([]);
+  const [customBuildsCursor, setCustomBuildsCursor] = useState(null);
   const [creatures, setCreatures] = useState([]);
   const [secrets, setSecrets] = useState([]);
   const [weaponSkills, setWeaponSkills] = useState([]);
@@ -49,43 +50,50 @@ function App() {
     fetchData();
   }, []);
 
+  const fetchCustomBuilds = async (cursor = null) => {
+    try {
+      const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`${API_BASE_URL}/api/custom-builds${params}`);
+      const data = await response.json();
+      const page = data.custom_builds || [];
+      setCustomBuilds(cursor ? (previous) => [...previous, ...page] : page);
+      setCustomBuildsCursor(data.next_cursor || null);
+    } catch (error) {
+      console.error('Error fetching custom builds:', error);
+    }
+  };
+
+  // Custom build lists only carry card fields; load the full build for the modal
+  const handleCustomBuildSelect = async (build) => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/custom-builds/${build.id}`);
+      setSelectedBuild(response.ok ? await response.json() : build);
+    } catch (error) {
+      console.error('Error fetching custom build:', error);
+      setSelectedBuild(build);
+    }
+  };
+
   const fetchData = async () => {
     try {
       setLoading(true);
-      const [bossesRes, charactersRes, buildsRes, achievementsRes, walkthroughsRes, customBuildsRes, creaturesRes, secretsRes, weaponSkillsRes, weaponPassivesRes] = await Promise.all([
-        fetch(`${API_BASE_URL}/api/bosses`),
-        fetch(`${API_BASE_URL}/api/characters`),
-        fetch(`${API_BASE_URL}/api/builds`),
-        fetch(`${API_BASE_URL}/api/achievements`),
-        fetch(`${API_BASE_URL}/api/walkthroughs`),
-        fetch(`${API_BASE_URL}/api/custom-builds`),
-        fetch(`${API_BASE_URL}/api/creatures`),
-        fetch(`${API_BASE_URL}/api/secrets`),
-        fetch(`${API_BASE_URL}/api/weapon-skills`),
-        fetch(`${API_BASE_URL}/api/weapon-passives`)
+      // The whole catalog comes from one bootstrap payload; custom builds are user data
+      const [bootstrapRes] = await Promise.all([
+        fetch(`${API_BASE_URL}/api/bootstrap`),
+        fetchCustomBuilds()
       ]);
 
-      const bossesData = await bossesRes.json();
-      const charactersData = await charactersRes.json();
-      const buildsData = await buildsRes.json();
-      const achievementsData = await achievementsRes.json();
-      const walkthroughsData = await walkthroughsRes.json();
-      const customBuildsData = await customBuildsRes.json();
-      const creaturesData = await creaturesRes.json();
-      const secretsData = await secretsRes.json();
-      const weaponSkillsData = await weaponSkillsRes.json();
-      const weaponPassivesData = await weaponPassivesRes.json();
+      const bootstrapData = await bootstrapRes.json();
 
-      setBosses(bossesData.bosses || []);
-      setCharacters(charactersData.characters || []);
-      setBuilds(buildsData.builds || []);
-      setAchievements(achievementsData.achievements || []);
-      setWalkthroughs(walkthroughsData.walkthroughs || []);
-      setCustomBuilds(customBuildsData.custom_builds || []);
-      setCreatures(creaturesData.creatures || []);
-      setSecrets(secretsData.secrets || []);
-      setWeaponSkills(weaponSkillsData.weapon_skills || []);
-      setWeaponPassives(weaponPassivesData.weapon_passives || []);
+      setBosses(bootstrapData.bosses || []);
+      setCharacters(bootstrapData.characters || []);
+      setBuilds(bootstrapData.builds || []);
+      setAchievements(bootstrapData.achievements || []);
+      setWalkthroughs(bootstrapData.walkthroughs || []);
+      setCreatures(bootstrapData.creatures || []);
+      setSecrets(bootstrapData.secrets || []);
+      setWeaponSkills(bootstrapData.weapon_skills || []);
+      setWeaponPassives(bootstrapData.weapon_passives || []);
     } catch (error) {
       console.error('Error fetching data:', error);
     } finally {
@@ -202,7 +210,7 @@ function App() {
           secondary_weapon: '',
           strategy: ''
         });
-        fetchData(); // Refresh custom builds
+        fetchCustomBuilds(); // Refresh custom builds
       }
     } catch (error) {
       console.error('Error creating custom build:', error);
@@ -306,10 +314,10 @@ function App() {
     </div>
   );
 
-  const BuildCard = ({ build }) => (
+  const BuildCard = ({ build, onSelect = setSelectedBuild }) => (
     <div 
       className="bg-gray-800 rounded-lg overflow-hidden shadow-lg cursor-pointer transform transition-transform hover:scale-105 border border-gray-700"
-      onClick={() => setSelectedBuild(build)}
+      onClick={() => onSelect(build)}
     >
       <div className="p-4">
         <div className="flex justify-between items-start mb-2">
@@ -1341,9 +1349,19 @@ function App() {
                 <BuildCard key={build.id} build={build} />
               ))}
               {customBuilds.map((build) => (
-                <BuildCard key={build.id} build={build} />
+                <BuildCard key={build.id} build={build} onSelect={handleCustomBuildSelect} />
               ))}
             </div>
+            {customBuildsCursor && (
+              <div className="flex justify-center mt-8">
+                <button
+                  onClick={() => fetchCustomBuilds(customBuildsCursor)}
+                  className="bg-purple-600 hover:bg-purple-700 px-6 py-2 rounded-md text-white font-semibold"
+                >
+                  Load More Builds
+                </button>
+              </div>
+            )}
           </div>
         )}
 
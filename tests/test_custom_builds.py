@@ -0,0 +1,91 @@
+"""Content hashing and the dedupe backfill of legacy custom builds."""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import pytest  # noqa: E402
+
+import custom_builds  # noqa: E402
+
+
+class FakeBuildStore:
+    """Just enough of the database module for backfill_submissions."""
+
+    def __init__(self, builds):
+        self.builds = {build["id"]: dict(build) for build in builds}
+
+    def _matches(self, build, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict) and "$exists" in condition:
+                if (field in build) != condition["$exists"]:
+                    return False
+            elif build.get(field) != condition:
+                return False
+        return True
+
+    async def find_all(self, collection, query=None, sort=None, **kwargs):
+        found = [dict(build) for build in self.builds.values() if self._matches(build, query or {})]
+        return sorted(found, key=lambda build: (build["created_at"], build["id"]))
+
+    async def find_one(self, collection, query, projection=None):
+        found = await self.find_all(collection, query)
+        return found[0] if found else None
+
+    async def update_one(self, collection, query, update, upsert=False):
+        found = await self.find_all(collection, query)
+        if not found:
+            return 0
+        build = self.builds[found[0]["id"]]
+        build.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            build[field] = build.get(field, 0) + amount
+        for field, values in update.get("$addToSet", {}).items():
+            build[field] = build.get(field, []) + [value for value in values["$each"] if value not in build[field]]
+        return 1
+
+    async def delete_one(self, collection, query):
+        found = await self.find_all(collection, query)
+        if not found:
+            return 0
+        del self.builds[found[0]["id"]]
+        return 1
+
+
+def legacy_build(build_id, minutes, **fields):
+    return {"id": build_id, "user_id": f"user-{build_id}",
+            "created_at": datetime(2024, 1, 1) + timedelta(minutes=minutes), **fields}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    def install(*builds):
+        fake = FakeBuildStore(builds)
+        for name in ("find_all", "find_one", "update_one", "delete_one"):
+            monkeypatch.setattr(custom_builds.database, name, getattr(fake, name))
+        return fake
+    return install
+
+
+def test_content_hash_accepts_non_string_list_items():
+    build = {"name": "A", "talismans": [2, " Gold  Scarab", 1], "stats": [{"x": 1}]}
+    reordered = {"name": "a", "talismans": [1, "gold scarab", 2], "stats": [{"x": 1}]}
+    assert custom_builds.content_hash(build) == custom_builds.content_hash(reordered)
+    assert custom_builds.content_hash({"name": "a", "talismans": [1, 2]})
+
+
+def test_backfill_merges_malformed_legacy_builds_and_skips_unhashable_ones(store):
+    fake = store(
+        legacy_build("a", 0, name="Odd", talismans=[1, 2], stats=[{"x": 1}]),
+        legacy_build("b", 1, name="odd", talismans=[2, 1], stats=[{"x": 1}]),
+        # Mixed key types cannot be serialised with sorted keys
+        legacy_build("c", 2, name="Broken", recommended_stats={1: 2, "vigor": 3}),
+    )
+    asyncio.run(custom_builds.backfill_submissions())
+
+    assert set(fake.builds) == {"a", "c"}
+    assert fake.builds["a"]["submission_count"] == 2
+    assert fake.builds["a"]["submitters"] == ["user-a", "user-b"]
+    assert "content_hash" not in fake.builds["c"]
@@ -0,0 +1,142 @@
+"""Failure handling of the rating write-behind buffer, against an in-memory store."""
+import asyncio
+import os
+import sys
+from typing import Any, Dict, NamedTuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import pytest  # noqa: E402
+from pymongo.errors import BulkWriteError  # noqa: E402
+
+import rating_buffer  # noqa: E402
+from database import BOSS_RATING_STATS, USER_RATINGS  # noqa: E402
+
+
+class RecordedUpdate(NamedTuple):
+    """Stands in for pymongo's UpdateOne so the store can read it."""
+    filter: Dict[str, Any]
+    update: Dict[str, Any]
+    upsert: bool = False
+
+
+def duplicate_key(position):
+    return {"index": position, "code": 11000, "errmsg": "E11000 duplicate key error"}
+
+
+class FakeRatingStore:
+    """Just enough of the database module for RatingBuffer.flush."""
+
+    def __init__(self):
+        self.ratings = {}
+        self.stats = {}
+        self.fail_stats = 0
+        self.fail_stats_for = set()
+        self.write_delay = 0.0
+
+    async def find_all(self, collection, query=None, **kwargs):
+        keys = {(clause["user_id"], clause["boss_id"]) for clause in query["$or"]}
+        return [dict(doc) for key, doc in self.ratings.items() if key in keys]
+
+    async def bulk_write(self, collection, operations):
+        errors = []
+        if collection == USER_RATINGS:
+            await asyncio.sleep(self.write_delay)
+            for position, operation in enumerate(operations):
+                key = (operation.filter["user_id"], operation.filter["boss_id"])
+                document = self.ratings.get(key)
+                if document is None:
+                    document = self.ratings[key] = dict(operation.filter)
+                elif document.get("counted_rating") != operation.filter["counted_rating"]:
+                    # The upsert collides with the stored rating on the unique index
+                    errors.append(duplicate_key(position))
+                    continue
+                document.update(operation.update["$set"])
+        elif collection == BOSS_RATING_STATS:
+            if self.fail_stats:
+                self.fail_stats -= 1
+                raise RuntimeError("stats write failed")
+            for position, operation in enumerate(operations):
+                boss_id = operation.filter["boss_id"]
+                if boss_id in self.fail_stats_for:
+                    self.fail_stats_for.discard(boss_id)
+                    errors.append(duplicate_key(position))
+                    continue
+                stats = self.stats.setdefault(boss_id, {})
+                for field, amount in operation.update["$inc"].items():
+                    stats[field] = stats.get(field, 0) + amount
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeRatingStore()
+    monkeypatch.setattr(rating_buffer, "UpdateOne", RecordedUpdate)
+    monkeypatch.setattr(rating_buffer.database, "find_all", store.find_all)
+    monkeypatch.setattr(rating_buffer.database, "bulk_write", store.bulk_write)
+    return store
+
+
+def test_retry_after_failed_stats_write_counts_the_vote(store):
+    async def scenario():
+        buffer = rating_buffer.RatingBuffer()
+        buffer.add("boss", "user", 7)
+        store.fail_stats = 1
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        assert len(buffer) == 0
+        await buffer.flush()
+
+    asyncio.run(scenario())
+    assert store.ratings[("user", "boss")]["rating"] == 7
+    assert store.stats["boss"] == {"sum": 7, "count": 1, "histogram.7": 1}
+
+
+def test_partial_stats_failure_retries_only_the_failed_aggregates(store):
+    async def scenario():
+        buffer = rating_buffer.RatingBuffer()
+        buffer.add("first", "user", 4)
+        buffer.add("second", "user", 9)
+        store.fail_stats_for = {"second"}
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        assert store.stats == {"first": {"sum": 4, "count": 1, "histogram.4": 1}}
+        await buffer.flush()
+
+    asyncio.run(scenario())
+    assert store.stats == {
+        "first": {"sum": 4, "count": 1, "histogram.4": 1},
+        "second": {"sum": 9, "count": 1, "histogram.9": 1},
+    }
+
+
+def test_concurrent_flushes_of_one_user_count_the_vote_once(store):
+    async def scenario():
+        first, second = rating_buffer.RatingBuffer(), rating_buffer.RatingBuffer()
+        first.add("boss", "anonymous", 7)
+        second.add("boss", "anonymous", 3)
+        store.write_delay = 0.01  # both read before either writes
+        assert await asyncio.gather(first.flush(), second.flush()) == [1, 0]
+        assert len(second) == 1
+        assert await second.flush() == 1
+
+    asyncio.run(scenario())
+    assert store.ratings[("anonymous", "boss")]["counted_rating"] == 3
+    assert store.stats["boss"] == {"sum": 3, "count": 1, "histogram.7": 0, "histogram.3": 1}
+
+
+def test_stop_during_flush_keeps_the_batch(store):
+    async def scenario():
+        buffer = rating_buffer.RatingBuffer(flush_interval=0.01)
+        buffer.start()
+        for user in range(10):
+            buffer.add("boss", f"user-{user}", 5)
+        store.write_delay = 0.05
+        await asyncio.sleep(0.03)  # the timer flush is now inside bulk_write
+        await buffer.stop()
+        assert len(buffer) == 0
+
+    asyncio.run(scenario())
+    assert len(store.ratings) == 10
+    assert store.stats["boss"]["count"] == 10
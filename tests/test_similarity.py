@@ -0,0 +1,42 @@
+"""Similarity index loading over malformed legacy custom builds."""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import similarity  # noqa: E402
+from database import BUILDS, CUSTOM_BUILDS  # noqa: E402
+
+CATALOG_BUILDS = [
+    {"id": "bleed", "name": "Bleed", "character": "Wylder", "type": "Offense",
+     "talismans": ["Lord of Blood's Exultation"], "primary_weapon": "Uchigatana",
+     "recommended_stats": {"strength": 20, "dexterity": 40}},
+    {"id": "faith", "name": "Faith", "character": "Recluse", "type": "Magic",
+     "talismans": ["Sacred Scorn"], "primary_weapon": "Sacred Seal",
+     "recommended_stats": {"faith": 50}},
+]
+
+
+def test_load_skips_builds_that_cannot_be_embedded(monkeypatch):
+    custom_builds = [
+        {"id": "stats-list", "name": "Stats list", "recommended_stats": [20, 40]},
+        {"id": "numeric-talismans", "name": "Numbers", "talismans": [1], "primary_weapon": 7},
+        {"id": "text-stats", "name": "Text", "recommended_stats": {"strength": "20", "faith": None}},
+        {"name": "No id"},
+        {"id": "clone", "name": "Clone", "character": "Wylder", "type": "Offense",
+         "talismans": ["Lord of Blood's Exultation"], "primary_weapon": "Uchigatana",
+         "recommended_stats": {"strength": 20, "dexterity": 40}},
+    ]
+
+    async def find_all(collection, query=None, **kwargs):
+        return custom_builds
+
+    monkeypatch.setattr(similarity.database, "find_all", find_all)
+    index = asyncio.run(similarity.load_similarity_index(CATALOG_BUILDS))
+
+    assert index is similarity.get_similarity_index()
+    for build_id in ("stats-list", "numeric-talismans", "text-stats", "clone"):
+        assert index.similar(CUSTOM_BUILDS, build_id) is not None
+    closest = index.similar(BUILDS, "bleed", limit=1)[0]
+    assert (closest["type"], closest["id"], closest["similarity"]) == (CUSTOM_BUILDS, "clone", 1.0)